@@ -1,7 +1,9 @@
 import lxml.etree as ET
 
+from beast_xml import DocumentIndex
 
-def replace_clock(root):
+
+def replace_clock(root, index=None):
     """
 
     >>> root = ET.XML("<beast><branchRateModel id="Clock" spec="beast.evolution.branchratemodel.StrictClockModel" clock.rate="@clockrate" /></beast>")
@@ -13,12 +15,15 @@ def replace_clock(root):
     </beast>
     """
 
-    clock_model = root.find(".//*[@id='Clock']")
+    if index is None:
+        index = DocumentIndex(root)
+
+    clock_model = index.id("Clock")
     assert clock_model is not None
     id = clock_model.attrib.get("id")
     name = clock_model.get("name") or clock_model.tag
     parent = clock_model.getparent()
-    burst_clock = ET.SubElement(
+    burst_clock = index.sub_element(
         parent,
         name,
         id="Clock",
@@ -26,12 +31,12 @@ def replace_clock(root):
         perSplit="@perSplit",
     )
     clock_model.addnext(burst_clock)
-    clock_model.set("id", "innerClock")
-    clock_model.set("name", "branchonlyClock")
+    index.set(clock_model, "id", "innerClock")
+    index.set(clock_model, "name", "branchonlyClock")
     burst_clock.append(clock_model)
 
-    state = root.find(".//state[@id='state']")
-    persplit = ET.SubElement(
+    state = index.find("state", id="state")
+    persplit = index.sub_element(
         state,
         "parameter",
         id="perSplit",
@@ -41,15 +46,15 @@ def replace_clock(root):
     persplit.text = "2e-4"
     state.append(persplit)
 
-    logger = root.find(".//logger[@id='tracelog']")
-    operator = ET.SubElement(
+    logger = index.find("logger", id="tracelog")
+    operator = index.sub_element(
         logger,
         "log",
         idref="perSplit",
     )
 
-    operators = root.find(".//operator").getparent()
-    operator = ET.SubElement(
+    operators = index.find("operator").getparent()
+    operator = index.sub_element(
         operators,
         "operator",
         spec="beast.evolution.operators.RealRandomWalkOperator",
@@ -61,8 +66,8 @@ def replace_clock(root):
     )
     operators.append(operator)
 
-    prior = root.find(".//distribution[@id='prior']")
-    persplitprior = ET.SubElement(
+    prior = index.find("distribution", id="prior")
+    persplitprior = index.sub_element(
         prior,
         "prior",
         spec="Prior",
@@ -70,7 +75,7 @@ def replace_clock(root):
         name="distribution",
         x="@perSplit",
     )
-    ET.SubElement(
+    index.sub_element(
         persplitprior,
         "distr",
         id="Normal.PerSplit",
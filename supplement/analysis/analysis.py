@@ -1,14 +1,21 @@
 import argparse
 import csv
 import itertools
+import json
+import os
+import re
 from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 import numpy
-from arviz import ess
-from matplotlib import pyplot as plt
+from scipy import fft, special, stats
+from matplotlib import cbook, pyplot as plt
 import matplotlib.ticker as ticker
 
+from screenlog import job_order, runtime_series, save_cache
+
 FAMILIES = [
     "Austronesian",
     "Bantu",
@@ -42,154 +49,687 @@ def family_to_path(family: str) -> str:
     return family.replace("-", "").lower()
 
 
-def read_logfile(vocabulary: Path, r: bool, b: bool, threshold: float = 200):
-    log: dict[str, list[float]] = defaultdict(list)
-    csvfile = csv.DictReader(
-        (r for r in vocabulary.open() if not r.startswith("#") if "\0" not in r),
-        dialect=BeastLogDialect,
-    )
-    fieldnames = csvfile.fieldnames[:]
-    if b:
-        fieldnames.append("Years")
-    if r:
-        fieldnames.append("clock_std")
-    fieldnames.append("clockrate_est")
-    fieldnames.append("yearloss")
-
-    step = None
-    previous = None
-    deviation = 0
-    write_back_fixed = csv.DictWriter(
-        vocabulary.with_suffix(".log2").open("w"), fieldnames, dialect=BeastLogDialect
+def log_lines(logfile, offset: int = 0):
+    """Yield the complete lines of a binary log file from a byte offset on.
+
+    A last line without line break, as in a log that is still being written,
+    is left out. Yield each line as text, together with the byte offset just
+    after it.
+
+    """
+    logfile.seek(offset)
+    for line in logfile:
+        if not line.endswith(b"\n"):
+            return
+        offset += len(line)
+        yield line.decode("utf-8", errors="replace"), offset
+
+
+def data_lines(lines, n_delimiters: int):
+    """Filter the usable data lines of a BEAST trace log.
+
+    Comment lines, lines corrupted by NUL bytes and lines with the wrong number
+    of fields are skipped.
+
+    """
+    return (
+        r
+        for r in lines
+        if not r.startswith("#")
+        if "\0" not in r
+        if r.count(BeastLogDialect.delimiter) == n_delimiters
     )
-    write_back_fixed.writeheader()
-    for n_row, row in enumerate(csvfile):
-        row["Sample"] = int(row["Sample"])
-        if step is None and previous is None:
-            previous = row["Sample"]
-        elif step is None and previous is not None:
-            step = int(row["Sample"]) - previous
-            previous = row["Sample"]
-        elif row["Sample"] - previous - step != deviation:
-            if args.print_expected:
+
+
+def read_header(vocabulary: Path) -> tuple[list[str], int]:
+    """Read the column names of a BEAST trace log.
+
+    Return them, together with the byte offset where the data lines start.
+
+    """
+    with vocabulary.open("rb") as logfile:
+        for line, offset in log_lines(logfile):
+            if not line.startswith("#") and "\0" not in line:
+                return line.rstrip("\n").split(BeastLogDialect.delimiter), offset
+    raise ValueError(f"{vocabulary:} has no header")
+
+
+def read_columns(
+    vocabulary: Path, header: list[str], offset: int
+) -> tuple[dict[str, numpy.ndarray], int]:
+    """Read a BEAST trace log from a byte offset on into one array per column.
+
+    Columns without a name, like the one BEAST creates by ending each line
+    with a tab, are dropped. Return the columns, and the byte offset after the
+    last complete line.
+
+    """
+    end = offset
+
+    def complete(logfile):
+        nonlocal end
+        for line, end in log_lines(logfile, offset):
+            yield line
+
+    usecols = [i for i, name in enumerate(header) if name]
+    with vocabulary.open("rb") as logfile:
+        lines = data_lines(complete(logfile), len(header) - 1)
+        first = next(lines, None)
+        if first is None:
+            table = numpy.empty((0, len(usecols)))
+        else:
+            table = numpy.loadtxt(
+                itertools.chain([first], lines),
+                delimiter=BeastLogDialect.delimiter,
+                usecols=usecols,
+                ndmin=2,
+            )
+    columns = {
+        header[i]: column
+        for i, column in zip(usecols, numpy.ascontiguousarray(table.T))
+    }
+    return columns, end
+
+
+def write_fixed_log(
+    vocabulary: Path,
+    log: dict[str, numpy.ndarray],
+    changed,
+    offset: int = 0,
+    first_row: int = 0,
+    copies: dict[str, str] = {},
+):
+    """Write a copy of the log with the changed columns taken from `log`.
+
+    The copy goes to a .log2 file next to the log. Changed columns that are
+    not in the log are appended, after its header and rows as they are. The
+    changed columns in `copies` take the text of another column of the log,
+    like `clockrate_est` of the clock rate, so only the others need to be
+    formatted. All other values are copied over as text.
+
+    If an offset into the log is given, only append the rows after it, which
+    are the rows of `log` from `first_row` on, to an existing copy.
+
+    """
+    delimiter = BeastLogDialect.delimiter
+    header, start = read_header(vocabulary)
+    n_delimiters = len(header) - 1
+    added = [key for key in changed if key not in header]
+    positions = [
+        header.index(key) if key in header else len(header) + added.index(key)
+        for key in changed
+    ]
+    sources = [header.index(copies[key]) if key in copies else None for key in changed]
+    columns = [
+        itertools.repeat(None)
+        if key in copies
+        else map(str, log[key][first_row:].astype(int).tolist())
+        if key == "Sample"
+        else map(repr, log[key][first_row:].tolist())
+        for key in changed
+    ]
+    with vocabulary.open("rb") as logfile, vocabulary.with_suffix(".log2").open(
+        "a" if offset else "w"
+    ) as fixed:
+        if not offset:
+            fixed.write(delimiter.join(header + added) + "\n")
+        lines = data_lines(
+            (line for line, _ in log_lines(logfile, offset or start)), n_delimiters
+        )
+        for line, *values in zip(lines, *columns):
+            fields = line.rstrip("\n").split(delimiter)
+            row = fields + added
+            for position, source, value in zip(positions, sources, values):
+                row[position] = value if source is None else fields[source]
+            fixed.write(delimiter.join(row) + "\n")
+
+
+def renumber_samples(
+    sample: numpy.ndarray,
+    print_expected: bool = False,
+    step=None,
+    previous=None,
+    deviation=0,
+):
+    """Replace the sample numbers after the first two by a regular sequence.
+
+    Restarted runs can leave gaps or overlaps in the sample numbers. The step
+    between the first two samples is taken as the regular step, and later
+    samples are renumbered to continue from there.
+
+    To continue renumbering rows appended to a log, pass the state (step,
+    previous sample, deviation) that the previous call returned along with
+    the renumbered samples.
+
+    """
+    raw = sample.copy()
+    i = 0
+    if previous is None and len(sample) > i:
+        previous = sample[i]
+        i += 1
+    if step is None and len(sample) > i:
+        step = sample[i] - previous
+        previous = sample[i]
+        i += 1
+    if len(sample) > i:
+        sample[i:] = previous + step * numpy.arange(1, len(sample) - i + 1)
+        deviations = raw[i:] - sample[i:]
+        before = numpy.r_[deviation, deviations[:-1]]
+        if print_expected:
+            for j in numpy.flatnonzero(deviations != before):
                 print(
-                    "Expected", previous + step + deviation, "but found", row["Sample"]
+                    "Expected", int(sample[i + j] + before[j]), "but found", int(raw[i + j])
                 )
-            previous = previous + step
-            deviation = row["Sample"] - previous
-            row["Sample"] = previous
-        else:
-            previous = previous + step
-            row["Sample"] = previous
-
-        if b:
-            row["perSplit"] = max(float(row["perSplit"]), 0)
-            row["Years"] = row["perSplit"] / float(row["clockrate"])
-        if r:
-            row["clockrate_est"] = row["RatesStat.mean"]
-            row["clock_std"] = float(row["RatesStat.variance"]) ** 0.5
+        previous = sample[-1]
+        deviation = deviations[-1]
+    return sample, (step, previous, deviation)
+
+
+def bulk_ess(draws: numpy.ndarray) -> numpy.ndarray:
+    """Compute the bulk effective sample size of every column of an array.
+
+    `draws` is a (samples × parameters) array, or a (chains × samples ×
+    parameters) array of several chains of the same length, like the
+    replicates of one analysis. For each parameter, this gives the same value
+    as `arviz.ess(..., method="bulk")` on that column (with the chains as
+    chains), but the rank normalization and the FFT autocovariances of all
+    columns are computed together.
+
+    >>> rng = numpy.random.default_rng(0)
+    >>> bulk_ess(rng.normal(size=(1000, 2))).round()
+    array([ 781., 1072.])
+
+    """
+    draws = numpy.asarray(draws, dtype=float)
+    if draws.ndim == 2:
+        draws = draws[None]
+    # Work on a (parameters × chains × samples) array, so that the sorting
+    # and the transforms run along contiguous memory.
+    draws = numpy.moveaxis(draws, -1, 0)
+    n_parameters = len(draws)
+    finite = numpy.isfinite(draws).all(axis=(1, 2))
+    half = draws.shape[2] // 2
+    if half < 2:
+        return numpy.full(n_parameters, numpy.nan)
+    # Split each chain in halves
+    draws = numpy.concatenate((draws[:, :, :half], draws[:, :, -half:]), axis=1)
+    n_chains, n_draws = draws.shape[1:]
+    size = n_chains * n_draws
+
+    # Rank normalization over all chains, column-wise
+    ranks = stats.rankdata(draws.reshape(n_parameters, size), axis=1)
+    z = special.ndtri((ranks - 3 / 8) / (size + 1 / 4)).reshape(draws.shape)
+
+    # Autocovariance of every chain and column at all lags at once
+    chain_mean = z.mean(axis=2)
+    m = fft.next_fast_len(2 * n_draws, real=True)
+    transformed = fft.rfft(z - chain_mean[..., None], n=m, workers=-1)
+    transformed *= transformed.conj()
+    acov = fft.irfft(transformed, n=m, workers=-1)[..., :n_draws]
+    acov = acov.mean(axis=1) / n_draws
+    mean_var = acov[:, 0] * n_draws / (n_draws - 1.0)
+    var_plus = mean_var * (n_draws - 1.0) / n_draws + chain_mean.var(axis=1, ddof=1)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        rho = 1.0 - (mean_var[:, None] - acov) / var_plus[:, None]
+    rho[:, 0] = 1.0
+
+    # Geyer's initial positive and initial monotone sequences, over the sums
+    # of pairs of consecutive autocorrelations
+    n_pairs = (n_draws - 1) // 2
+    pairs = rho[:, : 2 * n_pairs : 2] + rho[:, 1 : 2 * n_pairs : 2]
+    neff = numpy.full(n_parameters, float(size))
+    for j in range(n_parameters):
+        if not finite[j]:
+            neff[j] = numpy.nan
+            continue
+        if numpy.ptp(z[j]) < numpy.finfo(float).resolution:
+            continue
+        if numpy.isnan(rho[j]).any():
+            neff[j] = numpy.nan
+            continue
+        nonpositive = numpy.flatnonzero(pairs[j] <= 0)
+        end = max(min(nonpositive[0], n_pairs - 1) if len(nonpositive) else n_pairs - 1, 0)
+        last = 1.0
+        if end:
+            last = rho[j, 2 * end] if rho[j, 2 * end] > 0 or pairs[j, end] >= 0 else 0.0
+        tau = -1.0 + 2.0 * numpy.minimum.accumulate(pairs[j, :end]).sum() + last
+        neff[j] = size / max(tau, 1 / numpy.log10(size))
+    return neff
+
+
+# The number of bytes before the read offset that are compared to check that
+# a log was appended to, not replaced, since it was cached.
+FINGERPRINT = 256
+
+
+def load_log(vocabulary: Path, print_expected: bool = False, cache: bool = True):
+    """Load the sample-renumbered columns of a log, through a cache if possible.
+
+    The parsed columns are cached in a .npz file next to the log, together
+    with the byte offset up to which the log was read, the size and
+    modification time of the log, and the state of the sample renumbering.
+    If the log is unchanged, the cache is used as it is. If it has grown
+    since, and still ends the cached part with the same bytes, only the
+    appended rows are parsed and added to the cache. Otherwise the whole log
+    is read again.
+
+    Return the columns, the byte offset from which rows were newly read, the
+    index of the first newly read row, and whether renumbering changed any
+    sample number. If the whole log was read, that offset is 0; if nothing
+    was read, it is None.
+
+    """
+    cache_file = vocabulary.with_suffix(".npz")
+    log, state, offset, first_row = None, (None, None, 0), None, 0
+    renumbered = False
+    status = vocabulary.stat()
+    if cache and cache_file.exists():
+        with numpy.load(cache_file) as cached:
+            if "size" in cached and "mtime" in cached:
+                log = dict(zip(cached["columns"].tolist(), cached["table"]))
+                header = cached["header"].tolist()
+                offset = int(cached["offset"])
+                state = tuple(None if numpy.isnan(x) else x for x in cached["state"])
+                fingerprint = cached["fingerprint"].tobytes()
+                renumbered = bool(cached["renumbered"])
+                size, mtime = int(cached["size"]), int(cached["mtime"])
+        if log is not None and (status.st_size, status.st_mtime_ns) == (size, mtime):
+            return log, None, len(log["Sample"]), renumbered
+        if log is not None and status.st_size > size:
+            with vocabulary.open("rb") as logfile:
+                logfile.seek(max(offset - FINGERPRINT, 0))
+                if logfile.read(min(offset, FINGERPRINT)) != fingerprint:
+                    log = None
         else:
-            row["clockrate_est"] = row["clockrate"]
+            log = None
+        if log is None:
+            state, offset, renumbered = (None, None, 0), None, False
+
+    if log is None:
+        header, offset = read_header(vocabulary)
+    appended, end = read_columns(vocabulary, header, offset)
+    raw = appended["Sample"].copy()
+    appended["Sample"], state = renumber_samples(
+        appended["Sample"], print_expected, *state
+    )
+    renumbered = renumbered or bool((raw != appended["Sample"]).any())
+    if log is None:
+        log = appended
+        offset = 0
+    else:
+        first_row = len(log["Sample"])
+        log = {key: numpy.concatenate((log[key], appended[key])) for key in log}
+
+    if cache:
+        with vocabulary.open("rb") as logfile:
+            logfile.seek(max(end - FINGERPRINT, 0))
+            fingerprint = logfile.read(min(end, FINGERPRINT))
+        save_cache(
+            cache_file,
+            header=numpy.array(header),
+            offset=end,
+            size=status.st_size,
+            mtime=status.st_mtime_ns,
+            state=numpy.array([numpy.nan if x is None else x for x in state]),
+            fingerprint=numpy.frombuffer(fingerprint, dtype=numpy.uint8),
+            columns=numpy.array(list(log)),
+            table=numpy.array(list(log.values())),
+            renumbered=renumbered,
+        )
+    return log, offset, first_row, renumbered
+
+
+def load_log_tail(
+    vocabulary: Path, burnin: float = 0.1, thin: int = 1, chunk: int = 10_000
+) -> tuple[dict[str, numpy.ndarray], int]:
+    """Load only the rows of a log after burn-in, keeping every thin-th of them.
+
+    This reads the log twice: Once to count its rows, and then to parse only
+    the rows that are kept, in chunks, into arrays that are allocated with
+    their final size. So memory use is bounded by the kept rows, not by the
+    length of the run. Sample numbers are renumbered like by
+    `renumber_samples`, but deviations are not reported.
+
+    Return the columns, and the renumbered sample number of the last row.
+
+    """
+    header, offset = read_header(vocabulary)
+    n_delimiters = len(header) - 1
+    sample_column = header.index("Sample")
+    first_samples = []
+    n_rows = 0
+    with vocabulary.open("rb") as logfile:
+        for line in data_lines((line for line, _ in log_lines(logfile, offset)), n_delimiters):
+            if n_rows < 2:
+                first_samples.append(float(line.split(BeastLogDialect.delimiter)[sample_column]))
+            n_rows += 1
+    start = int(round(n_rows * burnin))
+    kept = numpy.arange(start, n_rows, thin)
+
+    usecols = [i for i, name in enumerate(header) if name]
+    table = numpy.empty((len(usecols), len(kept)))
+    with vocabulary.open("rb") as logfile:
+        lines = itertools.islice(
+            data_lines((line for line, _ in log_lines(logfile, offset)), n_delimiters),
+            start,
+            None,
+            thin,
+        )
+        # Rows that BEAST appended since the count are not read.
+        for i in range(0, len(kept), chunk):
+            table[:, i : i + chunk] = numpy.loadtxt(
+                list(itertools.islice(lines, min(chunk, len(kept) - i))),
+                delimiter=BeastLogDialect.delimiter,
+                usecols=usecols,
+                ndmin=2,
+            ).T
+    log = {header[i]: column for i, column in zip(usecols, table)}
+
+    # The first row keeps its sample number; later rows continue regularly
+    # with the step between the first two.
+    first = first_samples[0] if first_samples else 0.0
+    step = first_samples[1] - first if len(first_samples) > 1 else 0.0
+    log["Sample"][:] = first + step * kept
+    return log, int(first + step * (n_rows - 1))
+
+
+def read_logfile(
+    vocabulary: Path,
+    r: bool,
+    b: bool,
+    threshold: float = 200,
+    burnin: float = 0.1,
+    print_expected: bool = False,
+    cache: bool = True,
+    thin: int = 1,
+    low_memory: bool = False,
+):
+    """Load a log, add derived columns, and check the ESS of all columns.
+
+    Burn-in is removed and every thin-th of the remaining samples is kept.
+    With `low_memory`, only those rows are ever parsed, but neither the
+    cache nor the fixed .log2 copy of the log are written.
+
+    The .log2 copy, with the sample numbers fixed and the derived columns
+    added, is only written for logs in which sample numbers had to be fixed.
+
+    """
+    if low_memory:
+        log, n_samples = load_log_tail(vocabulary, burnin, thin)
+    else:
+        log, offset, first_row, renumbered = load_log(vocabulary, print_expected, cache)
+    columns = list(log)
+
+    if b:
+        log["perSplit"] = numpy.maximum(log["perSplit"], 0)
+        log["Years"] = log["perSplit"] / log["clockrate"]
+    if r:
+        log["clock_std"] = log["RatesStat.variance"] ** 0.5
+        log["clockrate_est"] = log["RatesStat.mean"]
+    else:
+        log["clockrate_est"] = log["clockrate"]
+    log["yearloss"] = (1 - (1 - log["lossrate"]) ** 1000) * 100
 
-        row["yearloss"] = (1 - (1 - float(row["lossrate"])) ** 1000) * 100
+    if not low_memory:
+        changed = (
+            ["Sample"] + (["perSplit"] if b else []) + [k for k in log if k not in columns]
+        )
+        copies = {"clockrate_est": "RatesStat.mean" if r else "clockrate"}
+        if renumbered and not vocabulary.with_suffix(".log2").exists():
+            write_fixed_log(vocabulary, log, changed, copies=copies)
+        elif renumbered and offset is not None:
+            write_fixed_log(vocabulary, log, changed, offset, first_row, copies)
 
-        for key, value in row.items():
-            try:
-                log[key].append(float(value))
-            except ValueError:
-                pass
+        n_samples = int(log["Sample"][-1])
+        for key, value in log.items():
+            log[key] = value[int(round(len(value) * burnin)) :: thin]
 
-        write_back_fixed.writerow(row)
     unconverged = False
     perSplit_ess = None
-    for key, value in log.items():
-        if key == "perSplit_ess":
-            continue
-        log[key] = value[int(round(len(value) * BURNIN)) :]
-        neff = ess(numpy.array(log[key]), method="bulk")
+    # In low memory mode, the ESS is computed column by column, because the
+    # transforms of all columns at once take several times the log's size.
+    values = list(log.values())
+    block = 1 if low_memory else len(values)
+    neffs = numpy.concatenate(
+        [
+            bulk_ess(numpy.column_stack(values[i : i + block]))
+            for i in range(0, len(values), block)
+        ]
+    )
+    for key, neff in zip(log, neffs):
         if key != "Sample" and neff < threshold:
             print(f"Effective sample size of {key:} in {vocabulary:} was {neff:}")
             unconverged = True
         if key == "perSplit":
             perSplit_ess = neff
     if unconverged:
-        print(
-            vocabulary.relative_to(Path("/home/gereon/BigData/burstclock-runs/")).parent
-        )
-        return {"n_samples_unconverged": [int(row["Sample"])]}
-        raise Unconverged()
+        print(vocabulary.parent)
+        return {"n_samples_unconverged": numpy.array([n_samples])}
     if perSplit_ess:
-        log["perSplit_ess"] = [perSplit_ess]
-    log["n_samples"] = [int(row["Sample"])]
+        log["perSplit_ess"] = numpy.array([perSplit_ess])
+    log["n_samples"] = numpy.array([n_samples])
     return log
 
 
-def get_runtime(path):
+def get_runtime(path, cache: bool = True, screenlogs=None):
     """Extract the mean time per Msample from all screenlogs.
 
     The estimated run time per Megasample is logged in the screenlog by beast,
     which gets turned into a .out file in the run directory by Slurm. This
     function returns the mean run time in hours per megasample for a particular
     run directory, aggregating from all available estimates in all available
-    .out files in the directory.
+    .out files in the directory. The time series of the estimates is available
+    from `screenlog.runtime_series`.
+
+    """
+    timings = runtime_series(path, cache, screenlogs)
+    return timings[:, 1].sum() / len(timings)
+
+
+class Run(NamedTuple):
+    """The files of one replicate run of an analysis."""
+
+    replicate: int
+    path: Path
+    log: Path | None
+    screenlogs: list[Path]
+    trees: list[Path]
+
+
+# The name of a run directory, after the family name
+RUN_DIRECTORY = r"(-relaxed)?(-burstclock)?-(\d+)"
+
+
+def discover_family(path: Path) -> dict[tuple[bool, bool], list[Run]]:
+    """Find the runs of a family, in one pass over its directory.
+
+    Run directories are named after the family directory, the model and the
+    replicate, like `bantu-relaxed-burstclock-3`, with any number of
+    replicates. Each run directory is listed once, to find its trace log,
+    Slurm screen logs and tree files.
+
+    Return the runs for each combination of relaxed clock (r) and bursts (b),
+    ordered by replicate.
+
+    """
+    pattern = re.compile(re.escape(path.name) + RUN_DIRECTORY)
+    runs = {(r, b): [] for r in [False, True] for b in [False, True]}
+    try:
+        entries = list(os.scandir(path))
+    except FileNotFoundError:
+        return runs
+    for entry in entries:
+        match = pattern.fullmatch(entry.name)
+        if not match or not entry.is_dir():
+            continue
+        log, screenlogs, trees = None, [], []
+        with os.scandir(entry.path) as files:
+            for file in files:
+                if file.name == "vocabulary.log":
+                    log = Path(file.path)
+                elif file.name.endswith(".out"):
+                    screenlogs.append(Path(file.path))
+                elif file.name.endswith(".trees"):
+                    trees.append(Path(file.path))
+        relaxed, bursts, replicate = match.groups()
+        runs[bool(relaxed), bool(bursts)].append(
+            Run(
+                int(replicate),
+                Path(entry.path),
+                log,
+                sorted(screenlogs, key=job_order),
+                sorted(trees),
+            )
+        )
+    for replicates in runs.values():
+        replicates.sort()
+    return runs
+
+
+def discover_runs(root: Path, families=FAMILIES, jobs: int | None = None):
+    """Find the runs of all families under root.
+
+    The family directories are scanned in parallel threads, because on a
+    network file system most of the time is spent waiting for the server.
+
+    """
+    with ThreadPoolExecutor(max_workers=jobs or len(families)) as pool:
+        return dict(
+            zip(
+                families,
+                pool.map(
+                    discover_family,
+                    [root / family_to_path(family) for family in families],
+                ),
+            )
+        )
+
+
+def process_run(run: Run, r: bool, b: bool, **options):
+    """Extract run time and log of one run.
+
+    This is the unit of work that is distributed over worker processes. The
+    options are passed on to `read_logfile`.
+
+    """
+    return (
+        get_runtime(run.path, options.get("cache", True), run.screenlogs),
+        read_logfile(run.log, r, b, **options),
+    )
+
+
+def submit_runs(runs: dict[tuple[bool, bool], list[Run]], pool: Executor, **options):
+    """Submit the runs of a family, as found by `discover_family`, to the pool.
+
+    Runs without a trace log are left out. Return the futures for each
+    combination of relaxed clock (r) and bursts (b), by replicate, so results
+    are combined in the same order no matter which finishes first.
+
+    """
+    return {
+        (r, b): {
+            run.replicate: pool.submit(process_run, run, r, b, **options)
+            for run in replicates
+            if run.log is not None
+        }
+        for (r, b), replicates in runs.items()
+    }
+
+
+def boxplot_summary(values) -> dict[str, float]:
+    """Summarize samples by what a boxplot without fliers shows of them.
+
+    Also include the 5% and 95% quantiles.
+
+    """
+    values = numpy.asarray(values, dtype=float)
+    summary = cbook.boxplot_stats(values)[0]
+    del summary["fliers"]
+    summary["q05"], summary["q95"] = (
+        numpy.quantile(values, [0.05, 0.95]) if len(values) else (numpy.nan, numpy.nan)
+    )
+    return {key: float(value) for key, value in summary.items()}
+
+
+# The summaries that are distributions of samples, pooled over replicates,
+# which are only kept as their boxplot statistics.
+SAMPLED = (
+    "Tree height ",
+    "Years per split ",
+    "Standard deviation of the clock relaxation ",
+    "Loss per 1000 years ",
+    "Clock rate ",
+)
+
+
+def summarize_runs(runs, pool_chains: bool = False):
+    """Summarize the runs of one family.
+
+    `runs` are the futures of the runs, as returned by `submit_runs`.
+
+    Return the summaries of each model, pooled over replicates, and a list of
+    summaries of the single replicates. Both are small and can be stored as
+    JSON, so that plotting does not need the logs.
+
+    With `pool_chains`, the ESS of the burst parameter is computed from the
+    replicates as chains of one analysis, cut to the length of the shortest
+    replicate, instead of as the minimum ESS of the single replicates.
 
     """
-    times = []
-    for slurm in path.glob("*.out"):
-        with slurm.open() as run_log:
-            for line in run_log:
-                if "Msample" in line:
-                    time = line.split()[-1][:-10]
-                    m, s = time.split("m")
-                    if "h" in m:
-                        h, m = m.split("h")
-                        m = int(h) * 60 + int(m)
-                    else:
-                        m = int(m)
-                    times.append(m + int(s) / 60)
-    return sum(times) / len(times) / 60
-
-
-def extract_statistics(path: Path, threshold: float = 200) -> dict[str, list[float]]:
-    basename = path.stem
     summaries = defaultdict(list)
+    replicates = []
     for r in [False, True]:
-        r_string = ["", "-relaxed"][r]
         for b in [False, True]:
-            b_string = ["", "-burstclock"][b]
-            log: dict[str, list[float]] = defaultdict(list)
-            for i in range(1, 10):
-                file = path / f"{basename:}{r_string}{b_string}-{i}"
-                if not file.exists():
-                    continue
-                runtime = get_runtime(file)
-                vocabulary = file / "vocabulary.log"
-                log_one_run = read_logfile(vocabulary, r, b, threshold)
+            runs_rb: dict[str, list[numpy.ndarray]] = defaultdict(list)
+            for i, future in runs[r, b].items():
+                runtime, log_one_run = future.result()
                 for key, value in log_one_run.items():
-                    log[key].extend(value)
-                # print(
-                #     runtime,
-                #     log["n_samples"][-1] / 1_000_000,
-                #     runtime * log["n_samples"][-1] / 1_000_000,
-                # )
-                try:
+                    runs_rb[key].append(value)
+                converged = "n_samples" in log_one_run
+                replicate = {
+                    "relaxed": r,
+                    "bursts": b,
+                    "replicate": i,
+                    "converged": converged,
+                    "hours per Msample": runtime,
+                    "samples": int(
+                        log_one_run["n_samples" if converged else "n_samples_unconverged"][-1]
+                    ),
+                }
+                if converged:
+                    replicate["tree height"] = boxplot_summary(log_one_run["TreeHeight"])
+                    if b:
+                        replicate["ESS of burst parameter"] = float(
+                            log_one_run["perSplit_ess"][-1]
+                        )
+                        replicate["burst probability"] = float(
+                            numpy.mean(log_one_run["perSplit"] > 0)
+                        )
+                replicates.append(replicate)
+                if "n_samples" in log_one_run:
                     summaries[
                         "Runtime "
                         + ("(relaxed" if r else "(strict")
                         + (" with bursts)" if b else ", no bursts)")
-                    ].append(runtime * log["n_samples"][-1] / 1_000_000)
-                except IndexError:
+                    ].append(runtime * log_one_run["n_samples"][-1] / 1_000_000)
+                else:
                     summaries[
                         "Runtime, incomplete "
                         + ("(relaxed" if r else "(strict")
                         + (" with bursts)" if b else ", no bursts)")
-                    ].append(runtime * log["n_samples_unconverged"][-1] / 1_000_000)
+                    ].append(
+                        runtime * log_one_run["n_samples_unconverged"][-1] / 1_000_000
+                    )
+            log = defaultdict(
+                list, {key: numpy.concatenate(value) for key, value in runs_rb.items()}
+            )
+            if runs_rb:
                 summaries[
                     "Tree height "
                     + ("(relaxed" if r else "(strict")
                     + (" with bursts)" if b else ", no bursts)")
                 ] = log["TreeHeight"]
-            if not log["yearloss"]:
+            if not len(log["yearloss"]):
                 continue
             if b:
                 summaries[
@@ -197,14 +737,18 @@ def extract_statistics(path: Path, threshold: float = 200) -> dict[str, list[flo
                 ] = log["Years"]
                 summaries[
                     "Changes per split " + ("(relaxed)" if r else "(strict)")
-                ] = numpy.quantile(
-                    [x for x in log["perSplit"] if x > 0], [0.05, 0.5, 0.95]
-                )
+                ] = numpy.quantile(log["perSplit"][log["perSplit"] > 0], [0.05, 0.5, 0.95])
+                if pool_chains:
+                    length = min(len(chain) for chain in runs_rb["perSplit"])
+                    chains = numpy.array([chain[-length:] for chain in runs_rb["perSplit"]])
+                    perSplit_ess = bulk_ess(chains[..., None])[0]
+                else:
+                    perSplit_ess = numpy.min(log["perSplit_ess"])
                 summaries[
                     "ESS of burst parameter " + ("(relaxed)" if r else "(strict)")
-                ] = numpy.min(log["perSplit_ess"])
+                ] = perSplit_ess
                 summaries["Bursts " + ("(relaxed)" if r else "(strict)")] = [
-                    numpy.mean(numpy.array(log["perSplit"]) > 0)
+                    numpy.mean(log["perSplit"] > 0)
                 ]
             if r:
                 summaries[
@@ -221,8 +765,18 @@ def extract_statistics(path: Path, threshold: float = 200) -> dict[str, list[flo
                 + ("(relaxed" if r else "(strict")
                 + (" with bursts)" if b else ", no bursts)")
             ] = log["clockrate_est"]
+    summaries = {
+        key: boxplot_summary(value) if key.startswith(SAMPLED) else value
+        for key, value in summaries.items()
+    }
+    return summaries, replicates
+
+
+def plot_statistics(basename: str, summaries, show: bool = False):
+    """Plot the summaries of one family, as returned by `summarize_runs`."""
+    summaries = defaultdict(lambda: boxplot_summary([]), summaries)
     plt.figure(figsize=(4, 6))
-    plt.boxplot(
+    plt.gca().bxp(
         [
             summaries["Years per split (strict)"],
             summaries["Years per split (relaxed)"],
@@ -235,14 +789,14 @@ def extract_statistics(path: Path, threshold: float = 200) -> dict[str, list[flo
     plt.savefig(
         Path(__file__).parent / f"{basename}_years_per_split.png", bbox_inches="tight"
     )
-    if args.show:
+    if show:
         plt.show()
     else:
         plt.close()
 
     plt.figure(figsize=(6, 4))
     plt.title("Tree height")
-    plt.boxplot(
+    plt.gca().bxp(
         [
             summaries["Tree height (strict, no bursts)"],
             summaries["Tree height (relaxed, no bursts)"],
@@ -267,7 +821,7 @@ def extract_statistics(path: Path, threshold: float = 200) -> dict[str, list[flo
     )
 
     plt.figure(figsize=(6, 4))
-    plt.boxplot(
+    plt.gca().bxp(
         [
             summaries["Clock rate (strict, no bursts)"],
             summaries["Clock rate (relaxed, no bursts)"],
@@ -293,7 +847,7 @@ def extract_statistics(path: Path, threshold: float = 200) -> dict[str, list[flo
 
     plt.figure(figsize=(6, 4))
     plt.title("Standard deviation of the clock relaxation")
-    plt.boxplot(
+    plt.gca().bxp(
         [
             summaries["Standard deviation of the clock relaxation (with bursts)"],
             summaries["Standard deviation of the clock relaxation (no bursts)"],
@@ -314,7 +868,7 @@ def extract_statistics(path: Path, threshold: float = 200) -> dict[str, list[flo
     )
 
     plt.figure(figsize=(6, 4))
-    plt.boxplot(
+    plt.gca().bxp(
         [
             summaries["Loss per 1000 years (strict, no bursts)"],
             summaries["Loss per 1000 years (relaxed, no bursts)"],
@@ -337,149 +891,233 @@ def extract_statistics(path: Path, threshold: float = 200) -> dict[str, list[flo
     plt.savefig(
         Path(__file__).parent / f"{basename}_replacement.png", bbox_inches="tight"
     )
-    if args.show:
+    if show:
         plt.show()
     else:
         plt.close()
-    return dict(summaries)
-
-
-parser = argparse.ArgumentParser()
-parser.add_argument("ess_threshold", type=float, nargs="?", default=200)
-parser.add_argument("--burnin", type=float, default=0.1)
-parser.add_argument("--print-expected", default=False, action="store_true")
-parser.add_argument("--show", default=False, action="store_true")
-args = parser.parse_args()
-BURNIN = args.burnin
-
-min_05 = 1
-max_95 = 0
-min_ess = numpy.inf
-max_ess = 0
-p_bursts = []
-
-runtimes = []
-incomplete_runtimes = []
-for f, family in enumerate(FAMILIES):
-    path = Path.home() / "BigData" / "burstclock-runs" / family_to_path(family)
-    s = extract_statistics(path, threshold=args.ess_threshold)
-
-    runtimes.extend(
-        [
-            s.get("Runtime (strict, no bursts)", numpy.nan),
-            s.get("Runtime (relaxed, no bursts)", numpy.nan),
-            s.get("Runtime (strict with bursts)", numpy.nan),
-            s.get("Runtime (relaxed with bursts)", numpy.nan),
-        ],
-    )
 
-    incomplete_runtimes.extend(
-        [
-            s.get("Runtime, incomplete (strict, no bursts)", [numpy.nan]),
-            s.get("Runtime, incomplete (relaxed, no bursts)", [numpy.nan]),
-            s.get("Runtime, incomplete (strict with bursts)", [numpy.nan]),
-            s.get("Runtime, incomplete (relaxed with bursts)", [numpy.nan]),
-        ],
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("ess_threshold", type=float, nargs="?", default=200)
+    parser.add_argument("--burnin", type=float, default=0.1)
+    parser.add_argument("--print-expected", default=False, action="store_true")
+    parser.add_argument("--show", default=False, action="store_true")
+    parser.add_argument(
+        "--no-cache",
+        default=False,
+        action="store_true",
+        help="Parse all logs again instead of using the cached columns in the .npz files next to them.",
+    )
+    parser.add_argument(
+        "--thin",
+        type=int,
+        default=1,
+        help="Only keep every THIN-th sample after burn-in.",
+    )
+    parser.add_argument(
+        "--low-memory",
+        default=False,
+        action="store_true",
+        help="Parse only the samples after burn-in (and thinning), reading each log twice, without writing caches or .log2 files.",
     )
+    parser.add_argument(
+        "--pool-chains",
+        default=False,
+        action="store_true",
+        help="Compute the ESS of the burst parameter over all replicates as chains, instead of taking the minimum over replicates.",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Number of worker processes reading logs. (default: One per CPU)",
+    )
+    parser.add_argument(
+        "--runs-root",
+        type=Path,
+        default=Path.home() / "BigData" / "burstclock-runs",
+        help="Directory containing one directory of runs per family. (default: ~/BigData/burstclock-runs)",
+    )
+    parser.add_argument(
+        "--summary",
+        type=Path,
+        default=Path(__file__).parent / "summary.json",
+        help="File to store the summaries of all runs in, from which the figures and stats.tex are made.",
+    )
+    parser.add_argument(
+        "--plot-only",
+        default=False,
+        action="store_true",
+        help="Do not read any logs, only make the figures and stats.tex from an existing summary file.",
+    )
+    args = parser.parse_args()
 
-    try:
-        if s["Changes per split (relaxed)"][0] < min_05:
-            min_05 = s["Changes per split (relaxed)"][0]
-            min_05_run = f"{family} (relaxed)"
-        if s["Changes per split (strict)"][0] < min_05:
-            min_05 = s["Changes per split (strict)"][0]
-            min_05_run = f"{family} (strict)"
-        if s["Changes per split (relaxed)"][2] > max_95:
-            max_95 = s["Changes per split (relaxed)"][2]
-            max_95_run = f"{family} (relaxed)"
-        if s["Changes per split (strict)"][2] > max_95:
-            max_95 = s["Changes per split (strict)"][2]
-            max_95_run = f"{family} (strict)"
-        if numpy.min(s["Bursts (relaxed)"]) == 1:
-            if s["ESS of burst parameter (relaxed)"] > max_ess:
-                max_ess = s["ESS of burst parameter (relaxed)"]
-                max_ess_run = f"{family} (relaxed)"
-            if s["ESS of burst parameter (relaxed)"] < min_ess:
-                min_ess = s["ESS of burst parameter (relaxed)"]
-                min_ess_run = f"{family} (relaxed)"
-        else:
-            for p in s["Bursts (relaxed)"]:
-                p_bursts.append(p / (1 - p))
-        if numpy.min(s["Bursts (strict)"]) == 1:
-            if s["ESS of burst parameter (strict)"] > max_ess:
-                max_ess = s["ESS of burst parameter (strict)"]
-                max_ess_run = f"{family} (strict)"
-            if s["ESS of burst parameter (strict)"] < min_ess:
-                min_ess = s["ESS of burst parameter (strict)"]
-                min_ess_run = f"{family} (strict)"
-        else:
-            for p in s["Bursts (strict)"]:
-                p_bursts.append(p / (1 - p))
+    if not args.plot_only:
+        discovered = discover_runs(args.runs_root)
+        summary = {
+            "ess_threshold": args.ess_threshold,
+            "burnin": args.burnin,
+            "families": {},
+            "replicates": [],
+        }
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            runs = {
+                family: submit_runs(
+                    discovered[family],
+                    pool,
+                    threshold=args.ess_threshold,
+                    burnin=args.burnin,
+                    print_expected=args.print_expected,
+                    cache=not args.no_cache,
+                    thin=args.thin,
+                    low_memory=args.low_memory,
+                )
+                for family in FAMILIES
+            }
+            for family in FAMILIES:
+                summaries, replicates = summarize_runs(
+                    runs[family], pool_chains=args.pool_chains
+                )
+                summary["families"][family] = summaries
+                summary["replicates"].extend(
+                    {"family": family, **replicate} for replicate in replicates
+                )
+        with args.summary.open("w") as summary_file:
+            json.dump(summary, summary_file, indent=1, default=lambda value: value.tolist())
 
-    except KeyError:
-        print(f"Error: Family {family} does not have converged data.")
+    with args.summary.open() as summary_file:
+        summary = json.load(summary_file)
 
+    min_05 = 1
+    max_95 = 0
+    min_ess = numpy.inf
+    max_ess = 0
+    p_bursts = []
 
-grouped_colors = ["#ad2c1a", "#ff8161", "#006989", "#54b3d6"]
+    runtimes = []
+    incomplete_runtimes = []
+    for family, s in summary["families"].items():
+        plot_statistics(family_to_path(family), s, show=args.show)
 
-plt.figure(figsize=(8, 4))
-plt.scatter(
-    [x + x // 4 for x, ys in enumerate(runtimes) for y in ys],
-    [y for ys in runtimes for y in ys],
-    edgecolors=[grouped_colors[x%4] for x, ys in enumerate(runtimes) for y in ys],
-    facecolors=[grouped_colors[x%4] for x, ys in enumerate(runtimes) for y in ys]
-)
-plt.scatter(
-    [x + x // 4 for x, ys in enumerate(incomplete_runtimes) for y in ys],
-    [y for ys in incomplete_runtimes for y in ys],
-    marker="o",
-    edgecolors=[grouped_colors[x%4] for x, ys in enumerate(incomplete_runtimes) for y in ys],
-    facecolors="none",
-)
-plt.xticks(
-    [0, 1, 2, 3, 5, 6, 7, 8, 10, 11, 12, 13, 15, 16, 17, 18],
-    [
-        "strict\nno bursts",
-        "relaxed\nno bursts",
-        "strict\nwith bursts",
-        "relaxed\nwith bursts",
-    ]
-    * len(FAMILIES),
-    rotation=90,
-    fontdict={"multialignment": "right"},
-)
-plt.xlim(-1, 5 * len(FAMILIES) - 1)
-
-ax2 = plt.gca().twiny()
-ax2.spines["bottom"].set_position(("axes", -0.35))
-ax2.tick_params("both", length=0, width=0, which="minor")
-ax2.tick_params("both", direction="in", which="major")
-ax2.xaxis.set_ticks_position("bottom")
-ax2.xaxis.set_label_position("bottom")
-
-ax2.set_xticks([-1, 4, 9, 14, 19])
-ax2.xaxis.set_major_formatter(ticker.NullFormatter())
-ax2.xaxis.set_minor_locator(ticker.FixedLocator([1.5, 6.5, 11.5, 16.5]))
-ax2.xaxis.set_minor_formatter(
-    ticker.FixedFormatter(["Austronesian", "Bantu", "Indo-European", "Sino-Tibetan"])
-)
+        runtimes.extend(
+            [
+                s.get("Runtime (strict, no bursts)", numpy.nan),
+                s.get("Runtime (relaxed, no bursts)", numpy.nan),
+                s.get("Runtime (strict with bursts)", numpy.nan),
+                s.get("Runtime (relaxed with bursts)", numpy.nan),
+            ],
+        )
+
+        incomplete_runtimes.extend(
+            [
+                s.get("Runtime, incomplete (strict, no bursts)", [numpy.nan]),
+                s.get("Runtime, incomplete (relaxed, no bursts)", [numpy.nan]),
+                s.get("Runtime, incomplete (strict with bursts)", [numpy.nan]),
+                s.get("Runtime, incomplete (relaxed with bursts)", [numpy.nan]),
+            ],
+        )
+
+        try:
+            if s["Changes per split (relaxed)"][0] < min_05:
+                min_05 = s["Changes per split (relaxed)"][0]
+                min_05_run = f"{family} (relaxed)"
+            if s["Changes per split (strict)"][0] < min_05:
+                min_05 = s["Changes per split (strict)"][0]
+                min_05_run = f"{family} (strict)"
+            if s["Changes per split (relaxed)"][2] > max_95:
+                max_95 = s["Changes per split (relaxed)"][2]
+                max_95_run = f"{family} (relaxed)"
+            if s["Changes per split (strict)"][2] > max_95:
+                max_95 = s["Changes per split (strict)"][2]
+                max_95_run = f"{family} (strict)"
+            if numpy.min(s["Bursts (relaxed)"]) == 1:
+                if s["ESS of burst parameter (relaxed)"] > max_ess:
+                    max_ess = s["ESS of burst parameter (relaxed)"]
+                    max_ess_run = f"{family} (relaxed)"
+                if s["ESS of burst parameter (relaxed)"] < min_ess:
+                    min_ess = s["ESS of burst parameter (relaxed)"]
+                    min_ess_run = f"{family} (relaxed)"
+            else:
+                for p in s["Bursts (relaxed)"]:
+                    p_bursts.append(p / (1 - p))
+            if numpy.min(s["Bursts (strict)"]) == 1:
+                if s["ESS of burst parameter (strict)"] > max_ess:
+                    max_ess = s["ESS of burst parameter (strict)"]
+                    max_ess_run = f"{family} (strict)"
+                if s["ESS of burst parameter (strict)"] < min_ess:
+                    min_ess = s["ESS of burst parameter (strict)"]
+                    min_ess_run = f"{family} (strict)"
+            else:
+                for p in s["Bursts (strict)"]:
+                    p_bursts.append(p / (1 - p))
+
+        except KeyError:
+            print(f"Error: Family {family} does not have converged data.")
+
+
+    grouped_colors = ["#ad2c1a", "#ff8161", "#006989", "#54b3d6"]
+
+    plt.figure(figsize=(8, 4))
+    plt.scatter(
+        [x + x // 4 for x, ys in enumerate(runtimes) for y in ys],
+        [y for ys in runtimes for y in ys],
+        edgecolors=[grouped_colors[x%4] for x, ys in enumerate(runtimes) for y in ys],
+        facecolors=[grouped_colors[x%4] for x, ys in enumerate(runtimes) for y in ys]
+    )
+    plt.scatter(
+        [x + x // 4 for x, ys in enumerate(incomplete_runtimes) for y in ys],
+        [y for ys in incomplete_runtimes for y in ys],
+        marker="o",
+        edgecolors=[grouped_colors[x%4] for x, ys in enumerate(incomplete_runtimes) for y in ys],
+        facecolors="none",
+    )
+    plt.xticks(
+        [0, 1, 2, 3, 5, 6, 7, 8, 10, 11, 12, 13, 15, 16, 17, 18],
+        [
+            "strict\nno bursts",
+            "relaxed\nno bursts",
+            "strict\nwith bursts",
+            "relaxed\nwith bursts",
+        ]
+        * len(FAMILIES),
+        rotation=90,
+        fontdict={"multialignment": "right"},
+    )
+    plt.xlim(-1, 5 * len(FAMILIES) - 1)
+
+    ax2 = plt.gca().twiny()
+    ax2.spines["bottom"].set_position(("axes", -0.35))
+    ax2.tick_params("both", length=0, width=0, which="minor")
+    ax2.tick_params("both", direction="in", which="major")
+    ax2.xaxis.set_ticks_position("bottom")
+    ax2.xaxis.set_label_position("bottom")
+
+    ax2.set_xticks([-1, 4, 9, 14, 19])
+    ax2.xaxis.set_major_formatter(ticker.NullFormatter())
+    ax2.xaxis.set_minor_locator(ticker.FixedLocator([1.5, 6.5, 11.5, 16.5]))
+    ax2.xaxis.set_minor_formatter(
+        ticker.FixedFormatter(["Austronesian", "Bantu", "Indo-European", "Sino-Tibetan"])
+    )
+
+    plt.ylim(bottom=0)
+    plt.savefig(Path(__file__).parent / "runtimes.png", bbox_inches="tight")
+    if args.show:
+        plt.show()
+    else:
+        plt.close()
 
-plt.ylim(bottom=0)
-plt.savefig(Path(__file__).parent / "runtimes.png", bbox_inches="tight")
-if args.show:
-    plt.show()
-else:
-    plt.close()
-
-with (Path(__file__).parent / "stats.tex").open("w") as stats:
-    print(r"\newcommand{\ess}{%d}" % args.ess_threshold, file=stats)
-    print(r"\newcommand{\burnin}{%d\%%}" % int(args.burnin * 100 + 0.5), file=stats)
-    print(r"\newcommand{\minx}{%f}" % min_05, file=stats)
-    print(r"\newcommand{\minn}{%s}" % min_05_run, file=stats)
-    print(r"\newcommand{\maxx}{%f}" % max_95, file=stats)
-    print(r"\newcommand{\maxn}{%s}" % max_95_run, file=stats)
-    print(r"\newcommand{\minessx}{%0.0f}" % min_ess, file=stats)
-    print(r"\newcommand{\minessn}{%s}" % min_ess_run, file=stats)
-    print(r"\newcommand{\maxessx}{%0.0f}" % max_ess, file=stats)
-    print(r"\newcommand{\maxessn}{%s}" % max_ess_run, file=stats)
-    print(r"\newcommand{\worstburst}{%0.1f}" % numpy.min(p_bursts), file=stats)
+    with (Path(__file__).parent / "stats.tex").open("w") as summary_file:
+        print(r"\newcommand{\ess}{%d}" % summary["ess_threshold"], file=summary_file)
+        print(
+            r"\newcommand{\burnin}{%d\%%}" % int(summary["burnin"] * 100 + 0.5), file=summary_file
+        )
+        print(r"\newcommand{\minx}{%f}" % min_05, file=summary_file)
+        print(r"\newcommand{\minn}{%s}" % min_05_run, file=summary_file)
+        print(r"\newcommand{\maxx}{%f}" % max_95, file=summary_file)
+        print(r"\newcommand{\maxn}{%s}" % max_95_run, file=summary_file)
+        print(r"\newcommand{\minessx}{%0.0f}" % min_ess, file=summary_file)
+        print(r"\newcommand{\minessn}{%s}" % min_ess_run, file=summary_file)
+        print(r"\newcommand{\maxessx}{%0.0f}" % max_ess, file=summary_file)
+        print(r"\newcommand{\maxessn}{%s}" % max_ess_run, file=summary_file)
+        print(r"\newcommand{\worstburst}{%0.1f}" % numpy.min(p_bursts), file=summary_file)
@@ -0,0 +1,246 @@
+import cProfile
+import io
+import pstats
+import tempfile
+import time
+from concurrent.futures import Executor, Future
+from pathlib import Path
+
+import numpy
+from scipy import signal
+
+from analysis import (
+    bulk_ess,
+    discover_family,
+    family_to_path,
+    read_logfile,
+    submit_runs,
+    summarize_runs,
+)
+
+# The columns of the trace logs of our analyses, with typical values and
+# autocorrelations.
+COLUMNS = {
+    "posterior": (-61000.0, 40.0, 0.99),
+    "likelihood": (-60000.0, 40.0, 0.99),
+    "prior": (-1000.0, 10.0, 0.95),
+    "TreeHeight": (5.0, 0.5, 0.995),
+    "clockrate": (1.5e-4, 1e-5, 0.99),
+    "lossrate": (2e-4, 2e-5, 0.98),
+    "perSplit": (0.02, 0.01, 0.999),
+    "RatesStat.mean": (1.5e-4, 1e-5, 0.99),
+    "RatesStat.variance": (4e-9, 1e-9, 0.98),
+    "RelaxedClockSigma": (0.4, 0.05, 0.99),
+}
+
+
+def columns(relaxed: bool, bursts: bool) -> list[str]:
+    """List the columns that a run of this model logs, in log order."""
+    return ["Sample"] + [
+        column
+        for column in COLUMNS
+        if (relaxed or not column.startswith(("RatesStat", "RelaxedClock")))
+        and (bursts or column != "perSplit")
+    ]
+
+
+def write_synthetic_log(
+    path: Path,
+    n_rows: int,
+    relaxed: bool = True,
+    bursts: bool = True,
+    step: int = 1000,
+    gaps: int = 3,
+    nul_lines: int = 2,
+    seed: int = 0,
+):
+    """Write a synthetic BEAST trace log, with the flaws of real ones.
+
+    Every column is an autocorrelated AR(1) series around a typical value.
+    The log starts with comment lines, and every line ends in a tab, like
+    BEAST writes them. `gaps` restarts skip or repeat sample numbers, and
+    `nul_lines` lines are overwritten by NUL bytes, as happens when a job is
+    killed while writing.
+
+    """
+    rng = numpy.random.default_rng(seed)
+    names = columns(relaxed, bursts)
+    table = numpy.empty((n_rows, len(names)))
+    sample = step * numpy.arange(n_rows)
+    for restart in rng.choice(numpy.arange(2, n_rows), size=min(gaps, n_rows - 2), replace=False):
+        sample[restart:] += step * rng.choice([-2, -1, 1, 5])
+    table[:, 0] = sample
+    for j, name in enumerate(names[1:], 1):
+        mean, sd, phi = COLUMNS[name]
+        noise = rng.normal(scale=sd * (1 - phi**2) ** 0.5, size=n_rows)
+        noise[0] = rng.normal(scale=sd)
+        x = mean + signal.lfilter([1.0], [1.0, -phi], noise)
+        # Only the burst parameter can be proposed below zero
+        table[:, j] = x if mean < 0 or name == "perSplit" else numpy.abs(x)
+    nul = set(rng.choice(n_rows, size=min(nul_lines, n_rows), replace=False).tolist())
+
+    with path.open("w") as log:
+        print("# Synthetic trace log", file=log)
+        print("#", file=log)
+        print("\t".join(names) + "\t", file=log)
+        for i, row in enumerate(table):
+            line = f"{int(row[0])}\t" + "\t".join(map(repr, row[1:].tolist())) + "\t"
+            if i in nul:
+                line = "\0" * len(line)
+            print(line, file=log)
+
+
+def write_synthetic_screenlog(path: Path, n_rows: int, step: int = 1000, seed: int = 0):
+    """Write a Slurm screen log with BEAST's timing estimates."""
+    rng = numpy.random.default_rng(seed)
+    with path.open("w") as out:
+        print("Start likelihood: -61000.0", file=out)
+        for sample in range(0, n_rows * step, max(n_rows * step // 100, 1)):
+            minutes = int(rng.integers(30, 150))
+            time = f"{minutes // 60}h{minutes % 60}m{rng.integers(60)}s"
+            print(f"{sample:>15}{-61000.0:>15.4f}{-60000.0:>15.4f} {time}/Msamples", file=out)
+
+
+def write_synthetic_family(
+    root: Path, family: str, n_rows: int, replicates: int = 3, seed: int = 0
+) -> Path:
+    """Write synthetic run directories for all models of a family.
+
+    The layout is the one `discover_family` expects. Return the family directory.
+
+    """
+    path = root / family_to_path(family)
+    for relaxed in [False, True]:
+        for bursts in [False, True]:
+            for i in range(1, replicates + 1):
+                run = path / (
+                    f"{path.stem}{'-relaxed' if relaxed else ''}"
+                    f"{'-burstclock' if bursts else ''}-{i}"
+                )
+                run.mkdir(parents=True, exist_ok=True)
+                seed += 1
+                write_synthetic_log(
+                    run / "vocabulary.log", n_rows, relaxed, bursts, seed=seed
+                )
+                write_synthetic_screenlog(run / "slurm-1.out", n_rows, seed=seed)
+    return path
+
+
+class SerialExecutor(Executor):
+    """Run submitted calls right away, so that the profiler sees them."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def profiled(name: str, function, profile_dir: Path | None, top: int = 0):
+    """Call function under cProfile, and save or print the profile.
+
+    Return the run time and the result of the call.
+
+    """
+    profile = cProfile.Profile()
+    start = time.perf_counter()
+    result = profile.runcall(function)
+    elapsed = time.perf_counter() - start
+    if profile_dir:
+        profile.dump_stats(profile_dir / f"{name}.prof")
+    if top:
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats("cumulative").print_stats(top)
+        print(stream.getvalue())
+    return elapsed, result
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Generate synthetic BEAST trace logs and Slurm screen logs,
+        and measure how fast analysis.py reads them, computes the ESS, and
+        summarizes a family of runs. The profiles of the stages are saved for
+        inspection with pstats or snakeviz."""
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=200_000,
+        help="""Number of samples per trace log""",
+    )
+    parser.add_argument(
+        "--replicates",
+        type=int,
+        default=3,
+        help="""Number of replicates of each model in the synthetic family""",
+    )
+    parser.add_argument(
+        "--directory",
+        type=Path,
+        help="""Directory to write the synthetic runs to. Existing logs there are reused. (default: A temporary directory)""",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        help="""Directory to save the cProfile output of each stage to""",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=0,
+        help="""Print the TOP functions by cumulative time of each stage""",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary:
+        root = args.directory or Path(temporary)
+        if args.profile_dir:
+            args.profile_dir.mkdir(parents=True, exist_ok=True)
+
+        log = root / "single" / "vocabulary.log"
+        if not log.exists():
+            log.parent.mkdir(parents=True, exist_ok=True)
+            write_synthetic_log(log, args.rows)
+        for cached in [log.with_suffix(".npz"), log.with_suffix(".log2")]:
+            cached.unlink(missing_ok=True)
+
+        elapsed, _ = profiled(
+            "read_logfile",
+            lambda: read_logfile(log, True, True, threshold=0),
+            args.profile_dir,
+            args.top,
+        )
+        print(f"read_logfile, parsing:   {elapsed:8.3f} s, {args.rows / elapsed:12.0f} rows/s")
+        elapsed, _ = profiled(
+            "read_logfile_cached",
+            lambda: read_logfile(log, True, True, threshold=0),
+            args.profile_dir,
+            args.top,
+        )
+        print(f"read_logfile, cached:    {elapsed:8.3f} s, {args.rows / elapsed:12.0f} rows/s")
+
+        draws = numpy.random.default_rng(0).normal(size=(args.rows, len(COLUMNS)))
+        draws = numpy.cumsum(draws, axis=0)
+        elapsed, _ = profiled("bulk_ess", lambda: bulk_ess(draws), args.profile_dir, args.top)
+        print(
+            f"bulk_ess, {len(COLUMNS):} columns:  {elapsed:8.3f} s,"
+            f" {args.rows / elapsed:12.0f} rows/s"
+        )
+
+        family = root / family_to_path("Bantu")
+        if not family.exists():
+            write_synthetic_family(root, "Bantu", args.rows, args.replicates)
+        rows = 4 * args.replicates * args.rows
+        elapsed, _ = profiled(
+            "summarize_runs",
+            lambda: summarize_runs(
+                submit_runs(discover_family(family), SerialExecutor(), threshold=0, cache=False)
+            ),
+            args.profile_dir,
+            args.top,
+        )
+        print(f"summarize_runs, serial:  {elapsed:8.3f} s, {rows / elapsed:12.0f} rows/s")
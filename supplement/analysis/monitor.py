@@ -0,0 +1,216 @@
+import time
+from pathlib import Path
+
+import numpy
+
+from analysis import read_columns, read_header
+
+
+class BatchMeans:
+    """Running batch means estimate of the ESS of the columns of a trace.
+
+    Rows are added as they arrive, and only the sums and sums of squares of
+    batches of consecutive rows are kept. When there are twice as many
+    batches as wanted, neighbouring batches are merged, doubling the batch
+    size, so memory use stays constant however long the trace grows.
+
+    >>> monitor = BatchMeans(n_batches=8)
+    >>> monitor.update(numpy.random.default_rng(0).normal(size=(10000, 2)))
+    >>> monitor.n, monitor.batch_size, len(monitor.sums)
+    (10000, 1024, 9)
+    >>> bool((monitor.ess() > 5000).all())
+    True
+
+    """
+
+    def __init__(self, n_batches: int = 64):
+        self.n_batches = n_batches
+        self.batch_size = 1
+        self.n = 0
+        self.shift = None
+        self.sums = None
+        self.squares = None
+        self.partial_sum = 0.0
+        self.partial_square = 0.0
+        self.partial_n = 0
+
+    def update(self, rows: numpy.ndarray):
+        """Add a (samples × parameters) block of rows at the end of the trace."""
+        if not len(rows):
+            return
+        if self.shift is None:
+            # Sums of squares are taken around the first row, to avoid
+            # cancellation for parameters like the posterior.
+            self.shift = rows[0].copy()
+            self.sums = numpy.empty((0, rows.shape[1]))
+            self.squares = numpy.empty((0, rows.shape[1]))
+        rows = rows - self.shift
+        self.n += len(rows)
+
+        fill = min(self.batch_size - self.partial_n, len(rows))
+        self.partial_sum = self.partial_sum + rows[:fill].sum(axis=0)
+        self.partial_square = self.partial_square + (rows[:fill] ** 2).sum(axis=0)
+        self.partial_n += fill
+        rows = rows[fill:]
+        if self.partial_n == self.batch_size:
+            self._close_batches(self.partial_sum[None], self.partial_square[None])
+            self.partial_sum, self.partial_square, self.partial_n = 0.0, 0.0, 0
+
+        while len(rows):
+            whole = len(rows) // self.batch_size * self.batch_size
+            if not whole:
+                self.partial_sum = rows.sum(axis=0)
+                self.partial_square = (rows**2).sum(axis=0)
+                self.partial_n = len(rows)
+                return
+            # Close only as many batches as fit before the next merge, which
+            # changes the batch size for the remaining rows.
+            room = max(2 * self.n_batches - len(self.sums), 1) * self.batch_size
+            whole = min(whole, room)
+            batches = rows[:whole].reshape(-1, self.batch_size, rows.shape[1])
+            self._close_batches(batches.sum(axis=1), (batches**2).sum(axis=1))
+            rows = rows[whole:]
+
+    def _close_batches(self, sums, squares):
+        self.sums = numpy.concatenate((self.sums, sums))
+        self.squares = numpy.concatenate((self.squares, squares))
+        if len(self.sums) >= 2 * self.n_batches:
+            self.sums = self.sums[0::2] + self.sums[1::2]
+            self.squares = self.squares[0::2] + self.squares[1::2]
+            self.batch_size *= 2
+
+    def ess(self, burnin: float = 0.0) -> numpy.ndarray:
+        """Estimate the ESS of each column, after discarding a burn-in fraction.
+
+        The burn-in is discarded in whole batches, so it is approximate. Return
+        NaN while there are fewer than two batches after burn-in. Columns that
+        are constant get the number of samples as ESS, like for arviz.
+
+        """
+        start = int(round(len(self.sums) * burnin)) if self.sums is not None else 0
+        if self.sums is None or len(self.sums) - start < 2:
+            width = 0 if self.shift is None else len(self.shift)
+            return numpy.full(width, numpy.nan)
+        sums = self.sums[start:]
+        n = len(sums) * self.batch_size
+        mean = sums.sum(axis=0) / n
+        variance = (self.squares[start:].sum(axis=0) / n - mean**2) * n / (n - 1)
+        batch_variance = (sums / self.batch_size).var(axis=0, ddof=1)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            ess = n * variance / (self.batch_size * batch_variance)
+        return numpy.where(variance > 0, ess, n)
+
+
+class LogMonitor:
+    """Follow a BEAST trace log that is being written, estimating ESS as it grows."""
+
+    def __init__(self, vocabulary: Path, n_batches: int = 64):
+        self.vocabulary = vocabulary
+        self.header = None
+        self.offset = None
+        self.columns = None
+        self.batch_means = BatchMeans(n_batches)
+
+    def poll(self) -> int:
+        """Read the rows appended since the last poll. Return how many there were."""
+        if self.header is None:
+            if not self.vocabulary.exists():
+                return 0
+            try:
+                self.header, self.offset = read_header(self.vocabulary)
+            except ValueError:
+                return 0
+        log, self.offset = read_columns(self.vocabulary, self.header, self.offset)
+        log.pop("Sample", None)
+        self.columns = list(log)
+        rows = numpy.column_stack(list(log.values()))
+        self.batch_means.update(rows)
+        return len(rows)
+
+    def ess(self, burnin: float = 0.1) -> dict[str, float]:
+        """Estimate the ESS of each column, like read_logfile does after the fact."""
+        if self.columns is None:
+            return {}
+        return dict(zip(self.columns, self.batch_means.ess(burnin)))
+
+
+def watch(
+    runs: list[Path],
+    threshold: float = 200,
+    burnin: float = 0.1,
+    interval: float = 60,
+    n_batches: int = 64,
+):
+    """Poll the logs of runs until all their columns reach the ESS threshold.
+
+    After every round of polling, print the smallest ESS of each run that has
+    not converged yet, and announce runs as they converge.
+
+    """
+    monitors = {run: LogMonitor(run / "vocabulary.log", n_batches) for run in runs}
+    converged = set()
+    while True:
+        for run, monitor in monitors.items():
+            if run in converged:
+                continue
+            monitor.poll()
+            ess = monitor.ess(burnin)
+            if not ess:
+                print(f"{run:}: no samples yet")
+                continue
+            worst = min(ess, key=lambda key: numpy.nan_to_num(ess[key], nan=-1))
+            if ess[worst] >= threshold:
+                converged.add(run)
+                print(
+                    f"{run:}: converged after {monitor.batch_means.n:} samples,"
+                    f" smallest ESS {ess[worst]:.0f} ({worst:})"
+                )
+            else:
+                print(
+                    f"{run:}: {monitor.batch_means.n:} samples,"
+                    f" smallest ESS {ess[worst]:.0f} ({worst:})"
+                )
+        if len(converged) == len(monitors):
+            return
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Watch the trace logs of running BEAST analyses and report
+        when every column of each run passes the ESS threshold, so that jobs
+        can be stopped as soon as they have converged. The ESS is estimated by
+        batch means while the logs grow, which is cheaper but rougher than the
+        bulk ESS computed by analysis.py."""
+    )
+    parser.add_argument(
+        "runs",
+        type=Path,
+        nargs="+",
+        help="""Run directories, each containing a vocabulary.log""",
+    )
+    parser.add_argument("--threshold", type=float, default=200)
+    parser.add_argument("--burnin", type=float, default=0.1)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=60,
+        help="""Seconds to wait between polls of the logs""",
+    )
+    parser.add_argument(
+        "--batches",
+        type=int,
+        default=64,
+        help="""Number of batches to keep for the batch means estimate""",
+    )
+    args = parser.parse_args()
+
+    watch(
+        args.runs,
+        threshold=args.threshold,
+        burnin=args.burnin,
+        interval=args.interval,
+        n_batches=args.batches,
+    )
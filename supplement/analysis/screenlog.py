@@ -0,0 +1,151 @@
+import os
+import re
+import tempfile
+from pathlib import Path
+
+import numpy
+
+# A screen log line with a timing estimate, like
+#   1000000    -123456.7890    -123456.7890    1h2m3s/Msamples
+# or without the hours field for faster runs. The groups are the sample
+# number, and the hours, minutes and seconds per megasample.
+TIMING = re.compile(
+    rb"^\s*(\d+)\s(?:[^\n]*?\s)?(?:(\d+)h)?(\d+)m(\d+)s/Msamples[ \t\r]*$", re.MULTILINE
+)
+
+# The number of bytes before the read offset that are compared to check that
+# a screen log was appended to, not replaced, since it was cached.
+FINGERPRINT = 256
+
+
+def save_cache(cache_file: Path, **arrays):
+    """Write arrays to a .npz cache file, atomically.
+
+    The arrays go to a temporary file next to the cache, which then replaces
+    it, so an interrupted run never leaves a truncated cache behind.
+
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=cache_file.parent, prefix=cache_file.name, suffix=".tmp", delete=False
+    ) as temporary:
+        try:
+            numpy.savez(temporary, **arrays)
+        except BaseException:
+            os.unlink(temporary.name)
+            raise
+    os.replace(temporary.name, cache_file)
+
+
+def parse_timings(text: bytes) -> numpy.ndarray:
+    """Parse the timing estimates in a chunk of screen log.
+
+    Return an array with one row (sample, hours per megasample) per estimate.
+
+    >>> parse_timings(b"Start\\n1000\\t-1.0\\t\\t1h3m0s/Msamples\\n2000\\t-1.0\\t\\t3m0s/Msamples\\n")
+    array([[1.00e+03, 1.05e+00],
+           [2.00e+03, 5.00e-02]])
+
+    """
+    matches = TIMING.findall(text)
+    timings = numpy.array(
+        [
+            (int(sample), int(h or 0) + int(m) / 60 + int(s) / 3600)
+            for sample, h, m, s in matches
+        ]
+    )
+    return timings.reshape(-1, 2)
+
+
+def screenlog_timings(screenlog: Path, cache: bool = True) -> numpy.ndarray:
+    """Extract the timing estimates of a screen log, through a cache if possible.
+
+    The parsed estimates are cached in a .npz file next to the screen log,
+    together with the byte offset up to which it was read, so that only the
+    part appended since is scanned the next time. A last line without line
+    break, as in the screen log of a running job, is left for later.
+
+    Return an array with one row (sample, hours per megasample) per estimate.
+
+    """
+    cache_file = screenlog.with_suffix(".npz")
+    timings, offset = numpy.empty((0, 2)), 0
+    if cache and cache_file.exists():
+        with numpy.load(cache_file) as cached:
+            timings = cached["timings"]
+            offset = int(cached["offset"])
+            fingerprint = cached["fingerprint"].tobytes()
+        with screenlog.open("rb") as out:
+            out.seek(max(offset - FINGERPRINT, 0))
+            if out.read(min(offset, FINGERPRINT)) != fingerprint:
+                timings, offset = numpy.empty((0, 2)), 0
+        if screenlog.stat().st_size == offset:
+            return timings
+
+    with screenlog.open("rb") as out:
+        out.seek(offset)
+        text = out.read()
+    end = offset + text.rfind(b"\n") + 1
+    timings = numpy.concatenate((timings, parse_timings(text[: end - offset])))
+
+    if cache:
+        with screenlog.open("rb") as out:
+            out.seek(max(end - FINGERPRINT, 0))
+            fingerprint = out.read(min(end, FINGERPRINT))
+        save_cache(
+            cache_file,
+            timings=timings,
+            offset=end,
+            fingerprint=numpy.frombuffer(fingerprint, dtype=numpy.uint8),
+        )
+    return timings
+
+
+def job_order(screenlog: Path):
+    """Sort key for screen logs, putting them in the order of their job numbers."""
+    return (len(screenlog.stem), screenlog.stem)
+
+
+def runtime_series(path: Path, cache: bool = True, screenlogs=None) -> numpy.ndarray:
+    """Collect the timing estimates of all screen logs in a run directory.
+
+    The screen logs are the .out files that Slurm writes into the run
+    directory, one per job, so a run that was restarted has several. Their
+    estimates are concatenated in the order of the job numbers. If the screen
+    logs are already known, pass them instead of listing the directory again.
+
+    Return an array with one row (sample, hours per megasample) per estimate.
+
+    """
+    if screenlogs is None:
+        screenlogs = sorted(path.glob("*.out"), key=job_order)
+    return numpy.concatenate(
+        [numpy.empty((0, 2))] + [screenlog_timings(out, cache) for out in screenlogs]
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Summarize the run time estimates in the Slurm screen logs
+        of BEAST run directories."""
+    )
+    parser.add_argument(
+        "runs",
+        type=Path,
+        nargs="+",
+        help="""Run directories, each containing one or more .out files""",
+    )
+    parser.add_argument("--no-cache", default=False, action="store_true")
+    args = parser.parse_args()
+
+    for run in args.runs:
+        timings = runtime_series(run, cache=not args.no_cache)
+        if not len(timings):
+            print(f"{run:}: no timing estimates")
+            continue
+        print(
+            f"{run:}: {len(timings):} estimates up to sample {int(timings[-1, 0]):},"
+            f" mean {timings[:, 1].mean():.3f} h/Msample,"
+            f" last {timings[-1, 1]:.3f} h/Msample"
+        )
@@ -0,0 +1,217 @@
+import copy
+from collections import defaultdict
+
+import lxml.etree as ET
+
+
+def read_xml(path):
+    """Parse a BEAST XML file into an lxml root element.
+
+    This uses the same parser settings as the individual post-processing
+    scripts, so that documents round-trip identically.
+
+    """
+    xmlparser = ET.XMLParser(remove_blank_text=True, resolve_entities=False)
+    return ET.parse(str(path), xmlparser).getroot()
+
+
+def expand_plates(root):
+    """Replace every plate by copies of its content, one for each value in its range.
+
+    This is what BEAST does when it reads the file, with each `$(var)` in
+    attribute values and text replaced by the value. Plates inside plates
+    are expanded after their outer plate, so they can use its variable.
+
+    >>> root = ET.XML('<run><plate var="c" range="a,b"><x id="x:$(c)"/></plate></run>')
+    >>> ET.tostring(expand_plates(root))
+    b'<run><x id="x:a"/><x id="x:b"/></run>'
+    >>> root = ET.XML('<run>a<y/>b<plate var="c" range=""><x/></plate>c</run>')
+    >>> ET.tostring(expand_plates(root))
+    b'<run>a<y/>bc</run>'
+
+    """
+    plates = list(root.iter("plate"))
+    while plates:
+        for plate in plates:
+            if next(plate.iterancestors("plate"), None) is not None:
+                continue
+            variable = f"$({plate.get('var'):})"
+            copies = []
+            for value in plate.get("range").split(","):
+                value = value.strip()
+                if not value:
+                    continue
+                for child in plate:
+                    instance = copy.deepcopy(child)
+                    for e in instance.iter():
+                        if isinstance(e.tag, str):
+                            for key, v in e.attrib.items():
+                                if variable in v:
+                                    e.set(key, v.replace(variable, value))
+                        if e.text and variable in e.text:
+                            e.text = e.text.replace(variable, value)
+                    copies.append(instance)
+            parent = plate.getparent()
+            position = parent.index(plate)
+            if copies:
+                copies[-1].tail = plate.tail
+            elif plate.tail:
+                # An empty plate leaves only its tail behind.
+                previous = plate.getprevious()
+                if previous is not None:
+                    previous.tail = (previous.tail or "") + plate.tail
+                else:
+                    parent.text = (parent.text or "") + plate.tail
+            parent[position : position + 1] = copies
+        plates = list(root.iter("plate"))
+    return root
+
+
+def compact(root):
+    """Remove comments and whitespace-only text, which BEAST ignores anyway."""
+    ET.strip_elements(root, ET.Comment, with_tail=False)
+    for e in root.iter():
+        if e.text and not e.text.strip():
+            e.text = None
+        if e.tail and not e.tail.strip():
+            e.tail = None
+    return root
+
+
+def write_xml(root, output=None, compact_output=False):
+    """Pretty-print a BEAST XML tree to output (default: Write to stdout).
+
+    With `compact_output`, write the smallest equivalent file instead, with
+    all plates expanded and without comments and indentation, which BEAST
+    reads and initializes faster. The tree itself is left unchanged.
+
+    """
+    et = root.getroottree()
+    encoding = et.docinfo.encoding
+    if compact_output:
+        root = compact(expand_plates(copy.deepcopy(root)))
+        et = root.getroottree()
+    if output:
+        with output.open("wb") as out:
+            et.write(
+                out,
+                pretty_print=not compact_output,
+                xml_declaration=True,
+                encoding=encoding,
+            )
+    else:
+        print(
+            ET.tostring(
+                root,
+                pretty_print=not compact_output,
+                xml_declaration=True,
+            ).decode("utf-8")
+        )
+
+
+class DocumentIndex:
+    """Look up the elements of a BEAST XML tree by id, spec, name and tag.
+
+    The index is built in one pass over the tree, after which lookups are
+    dictionary accesses instead of descendant searches. Transforms that add
+    elements or change indexed attributes must go through `sub_element`,
+    `set` and `remove` (or call `add` for elements built elsewhere), so that
+    the index stays consistent with the tree.
+
+    Elements are listed in document order of the original tree, followed by
+    later additions in the order they were added.
+
+    >>> root = ET.XML('<beast><run id="mcmc" spec="MCMC"><operator spec="A"/></run></beast>')
+    >>> index = DocumentIndex(root)
+    >>> index.find("operator").get("spec")
+    'A'
+    >>> op = index.sub_element(index.id("mcmc"), "operator", id="b", spec="B")
+    >>> [o.get("spec") for o in index.findall("operator")]
+    ['A', 'B']
+    >>> index.set(op, "spec", "C")
+    >>> index.find(spec="C") is op
+    True
+    >>> root = ET.XML('<beast><a traitname="x"/><b traitname="y"/><c/></beast>')
+    >>> [e.tag for e in DocumentIndex(root).findall(traitname="x")]
+    ['a']
+
+    """
+
+    KEYS = ("id", "spec", "name")
+
+    def __init__(self, root):
+        self.root = root
+        self.by_tag = defaultdict(list)
+        self.by_key = {key: defaultdict(list) for key in self.KEYS}
+        self.add(root)
+
+    def add(self, element):
+        """Register an element and all its descendants."""
+        for e in element.iter(ET.Element):
+            self.by_tag[e.tag].append(e)
+            for key in self.KEYS:
+                value = e.get(key)
+                if value is not None:
+                    self.by_key[key][value].append(e)
+
+    def discard(self, element):
+        """Unregister an element and all its descendants."""
+        for e in element.iter(ET.Element):
+            self.by_tag[e.tag].remove(e)
+            for key in self.KEYS:
+                value = e.get(key)
+                if value is not None:
+                    self.by_key[key][value].remove(e)
+
+    def remove(self, element):
+        """Remove an element from the tree and the index."""
+        self.discard(element)
+        element.getparent().remove(element)
+
+    def sub_element(self, parent, tag, **attrib):
+        """Create a registered subelement, like `ET.SubElement`."""
+        element = ET.SubElement(parent, tag, **attrib)
+        self.add(element)
+        return element
+
+    def set(self, element, key, value):
+        """Set an attribute of an element, updating the index."""
+        if key in self.KEYS:
+            old = element.get(key)
+            if old is not None:
+                self.by_key[key][old].remove(element)
+            self.by_key[key][value].append(element)
+        element.set(key, value)
+
+    def id(self, id):
+        """Return the element with the given id, or None."""
+        elements = self.by_key["id"].get(id)
+        return elements[0] if elements else None
+
+    def findall(self, tag=None, **attrib):
+        """List the elements with the given tag and attribute values.
+
+        `index.findall("log", spec=s)` matches what `root.findall(f".//log[@spec='{s}']")`
+        would find, except that the root itself is included.
+
+        """
+        candidates = []
+        if tag is not None:
+            candidates.append(self.by_tag.get(tag, []))
+        for key, value in attrib.items():
+            if key in self.KEYS:
+                candidates.append(self.by_key[key].get(value, []))
+        if not candidates:
+            candidates.append(list(self.root.iter(ET.Element)))
+        smallest = min(candidates, key=len)
+        return [
+            e
+            for e in smallest
+            if (tag is None or e.tag == tag)
+            and all(e.get(key) == value for key, value in attrib.items())
+        ]
+
+    def find(self, tag=None, **attrib):
+        """Return the first element with the given tag and attributes, or None."""
+        elements = self.findall(tag, **attrib)
+        return elements[0] if elements else None
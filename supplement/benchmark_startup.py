@@ -0,0 +1,151 @@
+import datetime
+import json
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from beast_xml import read_xml, write_xml
+from benchmark_transforms import git_commit, shipped_xmls
+
+# BEAST prints this once it has parsed the XML and initialized the state, just
+# before it starts sampling.
+READY = "Start likelihood"
+
+
+def _read_lines(stream, lines: queue.Queue):
+    """Put each line of a stream into a queue, and None at its end."""
+    for line in stream:
+        lines.put(line)
+    lines.put(None)
+
+
+def startup_time(beast: list[str], xml: Path, timeout: float = 600.0) -> float:
+    """Measure how long BEAST takes to parse and initialize an analysis.
+
+    BEAST runs in the directory of the XML file, so that its logs are
+    written there, and it is stopped as soon as it reports the starting
+    likelihood, or when the timeout is over, even if it prints nothing.
+
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        beast + ["-overwrite", "-seed", "1", xml.name],
+        cwd=xml.parent,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    lines = queue.Queue()
+    threading.Thread(target=_read_lines, args=(process.stdout, lines), daemon=True).start()
+    try:
+        while True:
+            try:
+                line = lines.get(timeout=max(start + timeout - time.perf_counter(), 0))
+            except queue.Empty:
+                raise TimeoutError(f"No starting likelihood after {timeout:} s") from None
+            if line is None:
+                raise RuntimeError(f"BEAST exited with {process.wait():} before starting to sample")
+            if READY in line:
+                return time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+
+
+def measure(beast: list[str], xml: Path, repeat: int = 3, timeout: float = 600.0) -> list[dict]:
+    """Compare BEAST startup on the pretty-printed and compact forms of an XML file.
+
+    Return one result per form, with the file size and the fastest startup
+    time over the repetitions.
+
+    """
+    results = []
+    root = read_xml(xml)
+    with tempfile.TemporaryDirectory() as directory:
+        for form in ("pretty", "compact"):
+            output = Path(directory) / f"{form:}.xml"
+            write_xml(root, output, compact_output=form == "compact")
+            result = {
+                "script": "beast_startup",
+                "input": os.path.relpath(xml, Path(__file__).parent),
+                "form": form,
+                "size_mb": output.stat().st_size / 2**20,
+            }
+            try:
+                result["startup"] = min(
+                    startup_time(beast, output, timeout) for _ in range(repeat)
+                )
+            except (OSError, RuntimeError, TimeoutError) as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import shlex
+
+    parser = argparse.ArgumentParser(
+        description="""Measure how long BEAST takes to parse and initialize the
+        XML files, written as usual and in the compact form with expanded plates
+        that the --compact option of pipeline.py and variants.py writes.
+        Results are appended to a JSON lines file, together with the commit."""
+    )
+    parser.add_argument(
+        "xmls",
+        type=Path,
+        nargs="*",
+        help="""BEAST XML files to start. (default: The base XML of every family and subset)""",
+    )
+    parser.add_argument(
+        "--beast",
+        default="beast",
+        help="""Command to run BEAST, with options, like 'beast -threads 4'""",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        default=3,
+        help="""Number of measurements of each form of each file, of which the fastest is reported""",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600.0,
+        help="""Seconds to wait for BEAST to start sampling""",
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        default=Path(__file__).parent / "benchmark_results.jsonl",
+        help="""File to append results to""",
+    )
+    args = parser.parse_args()
+
+    commit = git_commit()
+    date = datetime.datetime.now().isoformat(timespec="seconds")
+    beast = shlex.split(args.beast)
+
+    print(f"{'input':<50}{'form':>8}{'MB':>8}{'startup':>9}{'vs. pretty':>11}")
+    with args.results.open("a") as results_file:
+        for xml in args.xmls or shipped_xmls():
+            pretty, compact = measure(beast, xml, args.repeat, args.timeout)
+            for result in (pretty, compact):
+                print(json.dumps({"commit": commit, "date": date, **result}), file=results_file)
+                if "error" in result:
+                    print(f"{result['input']:<50}{result['form']:>8}  {result['error']}")
+                    continue
+                change = (
+                    f"{result['startup'] / pretty['startup']:>10.2f}x"
+                    if "startup" in pretty
+                    else ""
+                )
+                print(
+                    f"{result['input']:<50}{result['form']:>8}{result['size_mb']:>8.1f}"
+                    f"{result['startup']:>9.2f}{change:>11}"
+                )
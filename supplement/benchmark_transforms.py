@@ -0,0 +1,258 @@
+import datetime
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import add_burstclock
+import no_nested_sampling
+import pipeline
+import relax_clock
+import set_rho
+from beast_xml import DocumentIndex, read_xml, write_xml
+
+# The transforms to time, each taking the tree and an index of it. Where a
+# script needs more arguments on the command line, they are fixed to
+# typical values here.
+TRANSFORMS = {
+    "add_burstclock": add_burstclock.replace_clock,
+    "relax_clock": relax_clock.replace_clock,
+    "set_rho": lambda root, index: set_rho.replace_rho(
+        root, rho=min(set_rho.count_languages(root, index) / 1000, 1), index=index
+    ),
+    "no_nested_sampling": no_nested_sampling.replace_clock,
+    # What pipeline.py -j and -s do with config_sampled_ancestors
+    "config_sampled_ancestors": lambda root, index: pipeline.sampled_ancestors(
+        root, [index.find("sequence").get("taxon")], [], index
+    ),
+}
+
+# What an input must contain for a transform to apply to it, as a check on
+# the tree and its index and a description for skipping other inputs.
+PRECONDITIONS = {
+    "set_rho": (
+        lambda root, index: any(
+            (trait.text or "").strip()
+            for trait in index.findall("trait", traitname="date-backward")
+        ),
+        "no tip dates, the input is undated",
+    ),
+    "no_nested_sampling": (
+        lambda root, index: index.find("run", spec="beast.gss.NS") is not None,
+        "no nested sampling run to replace",
+    ),
+    "config_sampled_ancestors": (
+        lambda root, index: index.find("operator", spec="LeafToSampledAncestorJump") is not None,
+        "no sampled ancestor jump operator",
+    ),
+}
+
+
+def shipped_xmls(root: Path = Path(__file__).parent):
+    """List the base XML files of all families in the repository.
+
+    The clock model variants and the templates are left out.
+
+    """
+    return sorted(
+        path
+        for path in root.glob("*/*.xml")
+        if not any(
+            part in path.stem for part in ("-burstclock", "-relaxed", "-template")
+        )
+    )
+
+
+def measure(transform: str, xml: Path) -> dict:
+    """Time the phases of applying one transform to one XML file.
+
+    This is meant to run in a fresh worker process, so that the peak memory
+    use, which includes what libxml2 allocates outside of Python, can be
+    attributed to this one measurement.
+
+    """
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result = {
+        "script": transform,
+        "input": os.path.relpath(xml, Path(__file__).parent),
+    }
+    try:
+        start = time.perf_counter()
+        root = read_xml(xml)
+        result["parse"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = DocumentIndex(root)
+        result["index"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        root = TRANSFORMS[transform](root, index=index)
+        result["transform"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_xml(root, Path(os.devnull))
+        result["serialize"] = time.perf_counter() - start
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    # ru_maxrss is in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["peak_memory_mb"] = (peak - baseline) / 1024
+    return result
+
+
+def applicable(xmls, transforms=TRANSFORMS):
+    """Split the (transform, input) pairs into those to measure and those to skip.
+
+    Return the list of pairs to measure, and a list of skipped results, each
+    saying which precondition the input does not meet.
+
+    """
+    tasks, skipped = [], []
+    for xml in xmls:
+        root = read_xml(xml)
+        index = DocumentIndex(root)
+        for transform in transforms:
+            check, reason = PRECONDITIONS.get(transform, (lambda root, index: True, ""))
+            if check(root, index):
+                tasks.append((transform, xml))
+            else:
+                skipped.append(
+                    {
+                        "script": transform,
+                        "input": os.path.relpath(xml, Path(__file__).parent),
+                        "skipped": reason,
+                    }
+                )
+    return tasks, skipped
+
+
+def benchmark(tasks, repeat: int = 3):
+    """Measure every transform on its XML file in tasks, each `repeat` times.
+
+    Every measurement runs in its own freshly started process. Return one
+    result per transform and file, with the fastest time of each phase and
+    the largest peak memory use over the repetitions.
+
+    """
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = [
+            [pool.submit(measure, transform, xml) for _ in range(repeat)]
+            for transform, xml in tasks
+        ]
+        results = []
+        for repetitions in futures:
+            runs = [future.result() for future in repetitions]
+            result = dict(runs[0])
+            for phase in ("parse", "index", "transform", "serialize"):
+                if phase in result:
+                    result[phase] = min(run[phase] for run in runs)
+            result["peak_memory_mb"] = max(run["peak_memory_mb"] for run in runs)
+            results.append(result)
+    return results
+
+
+def git_commit() -> str:
+    """Describe the checked-out commit, marking uncommitted changes."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def previous_results(results_file: Path, commit: str) -> dict:
+    """Load the latest stored results of any other commit, by script and input."""
+    previous = {}
+    if not results_file.exists():
+        return previous
+    with results_file.open() as lines:
+        for line in lines:
+            result = json.loads(line)
+            if result["commit"] != commit and "error" not in result:
+                previous[result["script"], result["input"]] = result
+    return previous
+
+
+def total(result: dict) -> float:
+    return sum(result[phase] for phase in ("parse", "index", "transform", "serialize"))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Time the parse, index, transform and serialize phases and
+        measure the peak memory use of the XML transform scripts, on the XML
+        files shipped with the families. Results are appended to a JSON lines
+        file, together with the commit, and compared to the latest results of
+        another commit stored there."""
+    )
+    parser.add_argument(
+        "xmls",
+        type=Path,
+        nargs="*",
+        help="""BEAST XML files to transform. (default: The base XML of every family and subset)""",
+    )
+    parser.add_argument(
+        "--script",
+        "-s",
+        action="append",
+        choices=list(TRANSFORMS),
+        help="""Transform to benchmark. (default: All transforms)""",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        default=3,
+        help="""Number of measurements of each transform on each file, of which the fastest is reported""",
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        default=Path(__file__).parent / "benchmark_results.jsonl",
+        help="""File to append results to""",
+    )
+    args = parser.parse_args()
+
+    commit = git_commit()
+    previous = previous_results(args.results, commit)
+    date = datetime.datetime.now().isoformat(timespec="seconds")
+    xmls = args.xmls or shipped_xmls()
+    tasks, skipped = applicable(xmls, args.script or list(TRANSFORMS))
+    results = benchmark(tasks, repeat=args.repeat)
+
+    print(
+        f"{'script':<25}{'input':<50}{'parse':>8}{'index':>8}{'transf.':>8}"
+        f"{'serial.':>8}{'MB':>8}{'vs. prev.':>10}"
+    )
+    with args.results.open("a") as results_file:
+        for result in results:
+            result = {"commit": commit, "date": date, **result}
+            print(json.dumps(result), file=results_file)
+            if "error" in result:
+                print(f"{result['script']:<25}{result['input']:<50}  {result['error']}")
+                continue
+            before = previous.get((result["script"], result["input"]))
+            change = f"{total(result) / total(before):>9.2f}x" if before else ""
+            print(
+                f"{result['script']:<25}{result['input']:<50}"
+                f"{result['parse']:>8.3f}{result['index']:>8.3f}"
+                f"{result['transform']:>8.3f}{result['serialize']:>8.3f}"
+                f"{result['peak_memory_mb']:>8.1f}{change:>10}"
+            )
+    for result in skipped:
+        print(f"{result['script']:<25}{result['input']:<50}  skipped: {result['skipped']}")
@@ -1,12 +1,16 @@
 import sys
+import csv
+import json
+import hashlib
 import argparse
+from collections import defaultdict
 from pathlib import Path
 import lxml.etree as ET
 
-from tqdm import tqdm
-import pycldf
-import pyglottolog
-from cldfcatalog import Catalog
+from beast_xml import DocumentIndex
+from glottolog_index import CACHE_DIR, load_index, save_json
+
+CLDF = "http://cldf.clld.org/v1.0/terms.rdf#"
 
 
 def normal(mean, std):
@@ -25,92 +29,318 @@ FBD_REPLACEMENTS = {
     "TipDatesRandomWalker": "beast.evolution.operators.SampledNodeDateRandomWalker",
 }
 
-def calibration(
-        run, prior, trait, all_languages, d, languages=[], glottolog_clade=None, mean=0.0, name=None, replacements={}, monophyletic=False
-):
-    if glottolog_clade is not None:
-        languages = {
-            l for l, lineage in all_languages.items() if glottolog_clade in lineage
-        }
-    if name is None:
-        if glottolog_clade is None:
-            name = '_'.join(languages)
-        else:
-            name = glottolog_clade
+def clade_members(languages):
+    """Map every glottocode in the lineages of languages to the languages below it.
+
+    >>> clade_members({"a": ["a1", "fam"], "b": ["b1", "fam"]})["fam"] == {"a", "b"}
+    True
+
+    """
+    clades = defaultdict(set)
+    for language, lineage in languages.items():
+        for glottocode in lineage:
+            clades[glottocode].add(language)
+    return clades
+
 
-    if mean == 0.0:
-        mean = d.get("mean", mean)
+class CalibrationBatch:
+    """Collect the tip dates, operators and MRCA priors of many calibrations.
 
-    tag = d.pop('tag')
+    Building the elements detached from the tree and adding them in one go at
+    the end, with `emit`, keeps the date trait from being rebuilt string by
+    string for each dated tip.
 
-    if len(languages) == 0:
-        return
-    elif len(languages) == 1:
-        language = list(languages)[0]
-        if glottolog_clade:
-            mrcaprior = ET.SubElement(
-                prior,
+    """
+
+    def __init__(self, clades, replacements={}):
+        self.clades = clades
+        self.replacements = replacements
+        self.tip_dates = []
+        self.operators = []
+        self.priors = []
+
+    def add(
+            self, d, languages=[], glottolog_clade=None, mean=0.0, name=None, monophyletic=False
+    ):
+        if glottolog_clade is not None:
+            languages = self.clades.get(glottolog_clade, set())
+        if name is None:
+            if glottolog_clade is None:
+                name = '_'.join(languages)
+            else:
+                name = glottolog_clade
+
+        if mean == 0.0:
+            mean = d.get("mean", mean)
+
+        d = dict(d)
+        tag = d.pop('tag')
+
+        if len(languages) == 0:
+            return
+        elif len(languages) == 1:
+            language = list(languages)[0]
+            if glottolog_clade:
+                mrcaprior = ET.Element(
+                    "distribution",
+                    id=f"{language:}_originateMRCA",
+                    monophyletic="true" if monophyletic else "false",
+                    spec="beast.math.distributions.MRCAPrior",
+                    tree="@tree",
+                    useOriginate="true",
+                )
+                taxonset = ET.SubElement(
+                    mrcaprior, "taxonset", id=f"tx_{language:}", spec="TaxonSet"
+                )
+                ET.SubElement(taxonset, "taxon", idref=f"{language:}")
+                ET.SubElement(mrcaprior, tag, **d)
+            else:
+                self.tip_dates.append(f"{language:} = {mean:}")
+
+                op = ET.Element(
+                    "operator",
+                    id=f"TipDatesandomWalker:{language:}",
+                    spec=self.replacements.get("TipDatesRandomWalker", "beast.evolution.operators.TipDatesRandomWalker"),
+                    windowSize="1",
+                    tree="@tree",
+                    weight="3.0",
+                )
+                ET.SubElement(op, "taxonset", idref=f"{language:}_tip")
+                self.operators.append(op)
+
+                mrcaprior = ET.Element(
+                    "distribution",
+                    id=f"{language:}_tipMRCA",
+                    monophyletic="true" if monophyletic else "false",
+                    spec="beast.math.distributions.MRCAPrior",
+                    tree="@tree",
+                    tipsonly="true",
+                )
+                taxonset = ET.SubElement(
+                    mrcaprior, "taxonset", id=f"{language:}_tip", spec="TaxonSet"
+                )
+                ET.SubElement(taxonset, "taxon", idref=f"{language:}")
+                ET.SubElement(mrcaprior, tag, **d)
+        else:
+            mrcaprior = ET.Element(
                 "distribution",
-                id=f"{language:}_originateMRCA",
+                id=f"{name}_tipMRCA",
                 monophyletic="true" if monophyletic else "false",
                 spec="beast.math.distributions.MRCAPrior",
                 tree="@tree",
-                useOriginate="true",
             )
             taxonset = ET.SubElement(
-                mrcaprior, "taxonset", id=f"tx_{language:}", spec="TaxonSet"
+                mrcaprior, "taxonset", id=f"{name}", spec="TaxonSet"
+            )
+            plate = ET.SubElement(
+                taxonset, "plate", range=",".join(sorted(languages)), var="language"
             )
-            ET.SubElement(taxonset, "taxon", idref=f"{language:}")
+            ET.SubElement(plate, "taxon", idref="$(language)")
             ET.SubElement(mrcaprior, tag, **d)
-        else:
+        mrcaprior.tail = "\n"
+        self.priors.append(mrcaprior)
+
+    def emit(self, run, prior, trait, index=None):
+        """Add everything collected so far to the tree, and register it in the index."""
+        if self.tip_dates:
+            dates = ",\n".join(self.tip_dates)
             if not trait.text or not trait.text.strip():
-                trait.text = f"\n{language:} = {mean:}"
+                trait.text = f"\n{dates:}"
             else:
-                trait.text += f",\n{language:} = {mean:}"
-
-            op = ET.SubElement(
-                run,
-                "operator",
-                id=f"TipDatesandomWalker:{language:}",
-                spec=replacements.get("TipDatesRandomWalker", "beast.evolution.operators.TipDatesRandomWalker"),
-                windowSize="1",
-                tree="@tree",
-                weight="3.0",
-            )
-            ET.SubElement(op, "taxonset", idref=f"{language:}_tip")
+                trait.text = f"{trait.text:},\n{dates:}"
+        run.extend(self.operators)
+        prior.extend(self.priors)
+        if index is not None:
+            for element in self.operators + self.priors:
+                index.add(element)
+        self.tip_dates, self.operators, self.priors = [], [], []
 
-            mrcaprior = ET.SubElement(
-                prior,
-                "distribution",
-                id=f"{language:}_tipMRCA",
-                monophyletic="true" if monophyletic else "false",
-                spec="beast.math.distributions.MRCAPrior",
-                tree="@tree",
-                tipsonly="true",
-            )
-            taxonset = ET.SubElement(
-                mrcaprior, "taxonset", id=f"{language:}_tip", spec="TaxonSet"
-            )
-            ET.SubElement(taxonset, "taxon", idref=f"{language:}")
-            ET.SubElement(mrcaprior, tag, **d)
-    else:
-        mrcaprior = ET.SubElement(
-            prior,
-            "distribution",
-            id=f"{name}_tipMRCA",
-            monophyletic="true" if monophyletic else "false",
-            spec="beast.math.distributions.MRCAPrior",
-            tree="@tree",
-        )
-        taxonset = ET.SubElement(
-            mrcaprior, "taxonset", id=f"{name}", spec="TaxonSet"
+
+def calibration(
+        run, prior, trait, all_languages, d, languages=[], glottolog_clade=None, mean=0.0, name=None, replacements={}, monophyletic=False, index=None
+):
+    """Add a single calibration to the tree, as a `CalibrationBatch` of one.
+
+    `all_languages` maps language IDs to Glottolog lineages, as returned by
+    `load_languages`. To add many calibrations, use a `CalibrationBatch`,
+    which resolves the clades only once.
+
+    """
+    batch = CalibrationBatch(clade_members(all_languages), replacements)
+    batch.add(d, languages, glottolog_clade, mean, name, monophyletic)
+    batch.emit(run, prior, trait, index)
+
+
+SKELETON = """
+<beast><tree /><run><distribution id="posterior" spec="util.CompoundDistribution"><distribution id="prior" spec="util.CompoundDistribution" /></distribution></run></beast>
+"""
+
+
+def describe_language_table(metadata):
+    """Find the LanguageTable of a CLDF dataset and how to parse it.
+
+    Return the path of the table, its CSV dialect, and the names of its ID
+    and Glottocode columns, or None if the table is described in a way that
+    needs pycldf to read it.
+
+    """
+    with open(metadata, encoding="utf-8") as metadata_file:
+        description = json.load(metadata_file)
+    tables = [
+        t
+        for t in description.get("tables", [])
+        if t.get("dc:conformsTo") == f"{CLDF}LanguageTable"
+    ]
+    if len(tables) != 1 or not isinstance(tables[0].get("tableSchema"), dict):
+        return None
+    table = tables[0]
+    dialect = {**description.get("dialect", {}), **table.get("dialect", {})}
+    if (
+        dialect.get("header", True) is not True
+        or dialect.get("skipRows", 0)
+        or dialect.get("headerRowCount", 1) != 1
+    ):
+        return None
+    columns = table["tableSchema"]["columns"]
+    id = [c["name"] for c in columns if c.get("propertyUrl") == f"{CLDF}id"]
+    # The column named Glottocode, which load_languages has always read, or
+    # else the column marked as glottocodes.
+    glottocode = [c["name"] for c in columns if c["name"] == "Glottocode"] or [
+        c["name"] for c in columns if c.get("propertyUrl") == f"{CLDF}glottocode"
+    ]
+    if not id:
+        return None
+    return Path(metadata).parent / table["url"], dialect, id[0], glottocode[0] if glottocode else None
+
+
+def read_language_table(path, dialect, id, glottocode):
+    """Read only the ID and Glottocode columns of a LanguageTable CSV file."""
+    comment = dialect.get("commentPrefix", "#")
+    with path.open(encoding=dialect.get("encoding", "utf-8-sig"), newline="") as lines:
+        rows = csv.DictReader(
+            (line for line in lines if not (comment and line.startswith(comment))),
+            delimiter=dialect.get("delimiter", ","),
+            quotechar=dialect.get("quoteChar", '"'),
+            doublequote=dialect.get("doubleQuote", True),
+            skipinitialspace=dialect.get("skipInitialSpace", False),
         )
-        plate = ET.SubElement(
-            taxonset, "plate", range=",".join(sorted(languages)), var="language"
+        return [
+            (row[id].strip(), (row[glottocode] or "").strip() or None if glottocode else None)
+            for row in rows
+        ]
+
+
+def language_glottocodes(metadata, cache_dir=CACHE_DIR):
+    """List the (ID, Glottocode) pairs of the languages of a CLDF dataset.
+
+    The pairs are cached for each metadata file, together with the size and
+    modification time of the metadata and the LanguageTable, so that the
+    table is only parsed again when either changes. Datasets that
+    `describe_language_table` cannot handle are loaded with pycldf instead.
+
+    """
+    table = describe_language_table(metadata)
+    if table is None:
+        import pycldf
+        from tqdm import tqdm
+
+        ds = pycldf.Wordlist.from_metadata(metadata)
+        return [
+            (language[ds.column_names.languages.id], language["Glottocode"])
+            for language in tqdm(
+                ds["LanguageTable"], total=ds["LanguageTable"].common_props["dc:extent"]
+            )
+        ]
+
+    digest = hashlib.sha256(str(Path(metadata).resolve()).encode())
+    cache_file = cache_dir / f"languages-{digest.hexdigest():}.json"
+    status = [[s.st_size, s.st_mtime_ns] for s in (Path(metadata).stat(), table[0].stat())]
+    if cache_file.exists():
+        with cache_file.open() as cached:
+            cached = json.load(cached)
+        if isinstance(cached, dict) and cached["status"] == status:
+            return [tuple(pair) for pair in cached["languages"]]
+    pairs = read_language_table(*table)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    save_json({"status": status, "languages": pairs}, cache_file)
+    return pairs
+
+
+def load_languages(metadata, family=None, subset=None):
+    """Map each language ID in the CLDF dataset to its Glottolog lineage.
+
+    The lineage is the list of the language's own glottocode followed by all
+    its ancestors. Languages without a glottocode, not in the subset (an
+    iterable of lines, such as an open file), or outside the Glottolog clade
+    `family` are skipped.
+
+    """
+    if subset:
+        langs = {l.strip() for l in subset}
+
+    glottolog = load_index()
+    languages = {}
+    for id, glottocode in language_glottocodes(metadata):
+        if subset and id not in langs:
+            continue
+        if not glottocode:
+            continue
+        ancestors = glottolog.lineage(glottocode)
+        if family and family not in ancestors:
+            continue
+        languages[id] = ancestors
+    return languages
+
+
+def add_calibrations(
+    root, calibrations, languages, sampled_ancestors=False, first_writing=None, index=None
+):
+    """Add tip dates and MRCA priors for all calibrations to a BEAST XML tree.
+
+    `languages` maps language IDs to Glottolog lineages, as returned by
+    `load_languages`. If `sampled_ancestors` is set, use the operator variants
+    for sampled ancestor trees.
+
+    """
+    if index is None:
+        index = DocumentIndex(root)
+
+    prior, = index.findall("distribution", id="prior")
+
+    run = index.find("run")
+
+    traits = index.findall("trait")
+    if not traits:
+        tree = index.find("tree")
+        trait = index.sub_element(
+            tree,
+            "trait",
+            id="datetrait",
+            spec="beast.evolution.tree.TraitSet",
+            taxa="@taxa",
+            traitname="date-backward",
         )
-        ET.SubElement(plate, "taxon", idref="$(language)")
-        ET.SubElement(mrcaprior, tag, **d)
-    mrcaprior.tail = "\n"
+    else:
+        trait = traits[0]
+        assert trait.attrib["traitname"] == "date-backward"
+
+    batch = CalibrationBatch(
+        clade_members(languages), FBD_REPLACEMENTS if sampled_ancestors else {}
+    )
+    for c in calibrations:
+        batch.add(**c)
+    batch.emit(run, prior, trait, index)
+
+    if not trait.text or not trait.text.strip():
+        trait.text = "\n{language:} = {mean:}".format(language=next(iter(languages)), mean=0)
+        sa_jump = index.find("operator", spec="LeafToSampledAncestorJump")
+        index.remove(sa_jump)
+
+    if first_writing is not None:
+        change_time = index.id("SamplingChangeTime")
+        change_time.text = f"0. {first_writing:f}"
+
+    return run, prior, trait
 
 
 def main(calibrations):
@@ -155,80 +385,28 @@ def main(calibrations):
     )
     args = parser.parse_args()
 
-    ds = pycldf.Wordlist.from_metadata(args.metadata)
-
-    if args.subset:
-        langs = {l.strip() for l in args.subset}
-
-    with Catalog.from_config("glottolog", tag="v4.3") as glottolog_repo:
-        glottolog = pyglottolog.Glottolog(glottolog_repo.dir)
-        languages = {}
-        for language in tqdm(
-            ds["LanguageTable"], total=ds["LanguageTable"].common_props["dc:extent"]
-        ):
-            id = language[ds.column_names.languages.id]
-            if args.subset and id not in langs:
-                continue
-            try:
-                languoid = glottolog.languoid(language["Glottocode"])
-            except TypeError:
-                continue
-            ancestors = [languoid.id] + [a.id for a in languoid.ancestors]
-            if args.family and args.family not in ancestors:
-                continue
-            languages[id] = ancestors
+    languages = load_languages(args.metadata, family=args.family, subset=args.subset)
 
     if args.output_file is None:
-        root = ET.fromstring(
-            """
-        <beast><tree /><run><distribution id="posterior" spec="util.CompoundDistribution"><distribution id="prior" spec="util.CompoundDistribution" /></distribution></run></beast>
-        """
-        )
+        root = ET.fromstring(SKELETON)
         et = ET.ElementTree(root)
     elif args.output_file.exists():
         et = ET.parse(args.output_file.open("r"))
         root = et.getroot()
     else:
-        root = ET.fromstring(
-            """
-        <beast><tree /><run><distribution id="posterior" spec="util.CompoundDistribution"><distribution id="prior" spec="util.CompoundDistribution" /></distribution></run></beast>
-        """
-        )
+        root = ET.fromstring(SKELETON)
         et = ET.ElementTree(root)
 
-    prior, = [tag for tag in root.iter("distribution") if tag.attrib.get("id") == "prior"]
-
-    run = list(root.iter("run"))[0]
-
-    traits = list(root.iter("trait"))
-    if not traits:
-        tree = list(root.iter("tree"))[0]
-        trait = ET.SubElement(
-            tree,
-            "trait",
-            id="datetrait",
-            spec="beast.evolution.tree.TraitSet",
-            taxa="@taxa",
-            traitname="date-backward",
-        )
-    else:
-        trait = traits[0]
-        assert trait.attrib["traitname"] == "date-backward"
-
     for lang in languages:
         print(lang)
 
-    for c in calibrations:
-        calibration(run, prior, trait, languages, replacements=FBD_REPLACEMENTS if args.sampled_ancestors else {}, **c)
-
-    if not trait.text or not trait.text.strip():
-        trait.text = "\n{language:} = {mean:}".format(language=next(iter(languages)), mean=0)
-        sa_jump = root.find(".//operator[@spec='LeafToSampledAncestorJump']")
-        sa_jump.getparent().remove(sa_jump)
-
-    if args.first_writing is not None:
-        run = [tag for tag in root.iter() if tag.attrib.get("id") == "SamplingChangeTime"][0]
-        run.text = f"0. {args.first_writing:f}"
+    run, prior, trait = add_calibrations(
+        root,
+        calibrations,
+        languages,
+        sampled_ancestors=args.sampled_ancestors,
+        first_writing=args.first_writing,
+    )
 
     et.write(args.output_file.open("wb"))
     return et, root, run, prior, trait, languages
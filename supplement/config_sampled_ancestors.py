@@ -1,8 +1,10 @@
 import logging
 import lxml.etree as ET
 
+from beast_xml import DocumentIndex
 
-def set_tips(root, tips):
+
+def set_tips(root, tips, index=None):
     """
 
     >>> root = ET.XML("<beast><branchRateModel id="Clock" spec="beast.evolution.branchratemodel.StrictClockModel" clock.rate="@clockrate" /></beast>")
@@ -13,13 +15,15 @@ def set_tips(root, tips):
       </branchRateModel>
     </beast>
     """
-    starting_tree = root.find(".//init[@spec='beast.evolution.tree.RandomTreeWithSA']")
+    if index is None:
+        index = DocumentIndex(root)
+    starting_tree = index.find("init", spec="beast.evolution.tree.RandomTreeWithSA")
     for tip in tips:
-        ET.SubElement(starting_tree, "sampledAncestor", idref=tip)
+        index.sub_element(starting_tree, "sampledAncestor", idref=tip)
     return root
 
 
-def into_jump_operator(root, tips):
+def into_jump_operator(root, tips, index=None):
     """
 
     >>> root = ET.XML("<beast><branchRateModel id="Clock" spec="beast.evolution.branchratemodel.StrictClockModel" clock.rate="@clockrate" /></beast>")
@@ -30,9 +34,11 @@ def into_jump_operator(root, tips):
       </branchRateModel>
     </beast>
     """
-    operator = root.find(".//operator[@spec='LeafToSampledAncestorJump']")
+    if index is None:
+        index = DocumentIndex(root)
+    operator = index.find("operator", spec="LeafToSampledAncestorJump")
     for tip in tips:
-        ET.SubElement(operator, "sampledTaxa", idref=tip)
+        index.sub_element(operator, "sampledTaxa", idref=tip)
     return root
 
 
@@ -0,0 +1,212 @@
+import functools
+import json
+import os
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+GLOTTOLOG_TAG = "v4.3"
+
+# Where the indices of the Glottolog versions are kept
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "burstclock"
+
+
+def save_json(data, path: Path):
+    """Write data to a JSON cache file, atomically.
+
+    The file is written under a temporary name next to `path` and then moved
+    into place, so an interrupted run leaves no truncated cache behind.
+
+    """
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, prefix=path.name, suffix=".tmp", delete=False
+    ) as temporary:
+        try:
+            json.dump(data, temporary, separators=(",", ":"))
+        except BaseException:
+            os.unlink(temporary.name)
+            raise
+    os.replace(temporary.name, path)
+
+
+class UnknownLanguoid(KeyError):
+    """A glottocode that is not in the Glottolog index."""
+
+    def __str__(self):
+        return f"Glottocode {self.args[0]} is not in the Glottolog index"
+
+
+class GlottologIndex:
+    """The tree of all Glottolog languoids, with their levels and endangerment.
+
+    Reading a languoid and its ancestors with pyglottolog means reading INI
+    files all over the Glottolog repository. This index holds, for every
+    glottocode, only the parent, level and endangerment status, which is
+    enough for everything the calibration and sampling proportion steps need,
+    and it is small enough to be stored and loaded in an instant. The number
+    of living languages in every clade is counted when the index is built
+    and stored with it.
+
+    >>> index = GlottologIndex({
+    ...     "fam1": [None, "family", None],
+    ...     "lang": ["fam1", "language", "extinct"],
+    ...     "dial": ["lang", "dialect", None],
+    ... })
+    >>> index.lineage("dial")
+    ['dial', 'lang', 'fam1']
+    >>> index.children("fam1"), index.level("lang"), index.endangerment("lang")
+    (['lang'], 'language', 'extinct')
+    >>> index.count_living_languages("fam1")
+    0
+    >>> index.lineage("unkn1234")
+    Traceback (most recent call last):
+    ...
+    glottolog_index.UnknownLanguoid: Glottocode unkn1234 is not in the Glottolog index
+
+    """
+
+    def __init__(self, languoids: dict[str, list], living_languages: dict[str, int] = None):
+        self.languoids = languoids
+        self._children = defaultdict(list)
+        for glottocode, (parent, _, _) in languoids.items():
+            if parent is not None:
+                self._children[parent].append(glottocode)
+        if living_languages is None:
+            living_languages = self._living_language_counts()
+        self.living_languages = living_languages
+
+    def __contains__(self, glottocode):
+        return glottocode in self.languoids
+
+    def _languoid(self, glottocode: str) -> list:
+        try:
+            return self.languoids[glottocode]
+        except KeyError:
+            raise UnknownLanguoid(glottocode) from None
+
+    def parent(self, glottocode: str) -> str | None:
+        return self._languoid(glottocode)[0]
+
+    def level(self, glottocode: str) -> str:
+        """The level of a languoid: family, language or dialect."""
+        return self._languoid(glottocode)[1]
+
+    def endangerment(self, glottocode: str) -> str | None:
+        """The endangerment status of a languoid, such as "extinct", if known."""
+        return self._languoid(glottocode)[2]
+
+    def children(self, glottocode: str) -> list[str]:
+        return self._children.get(glottocode, [])
+
+    def ancestors(self, glottocode: str) -> list[str]:
+        """List the ancestors of a languoid, from its parent up to the top."""
+        ancestors = []
+        parent = self.parent(glottocode)
+        while parent is not None:
+            ancestors.append(parent)
+            parent = self.parent(parent)
+        return ancestors
+
+    def lineage(self, glottocode: str) -> list[str]:
+        """List the glottocode of a languoid, followed by those of its ancestors."""
+        return [glottocode] + self.ancestors(glottocode)
+
+    def count_living_languages(self, clade: str) -> int:
+        """The number of languages in a clade that are not extinct."""
+        try:
+            return self.living_languages[clade]
+        except KeyError:
+            raise UnknownLanguoid(clade) from None
+
+    def _living_language_counts(self) -> dict[str, int]:
+        """Count the living languages of all clades together, in one pass from the leaves up."""
+        # Order the languoids from the top down, so that every languoid comes
+        # after its parent, and then count in the reverse order.
+        order = [code for code, (parent, _, _) in self.languoids.items() if parent is None]
+        for code in order:
+            order.extend(self.children(code))
+        counts = dict.fromkeys(order, 0)
+        for code in reversed(order):
+            parent, level, endangerment = self.languoids[code]
+            if level == "language" and endangerment != "extinct":
+                counts[code] += 1
+            if parent is not None:
+                counts[parent] += counts[code]
+        return counts
+
+    @classmethod
+    def from_glottolog(cls, glottolog):
+        """Build the index from a `pyglottolog.Glottolog`, in one walk over it."""
+        languoids = {}
+        for languoid in glottolog.languoids():
+            # The lineage runs from the top-level family down to the parent.
+            lineage = languoid.lineage
+            languoids[languoid.id] = [
+                lineage[-1][1] if lineage else None,
+                languoid.level.id,
+                languoid.endangerment.status.id if languoid.endangerment else None,
+            ]
+        return cls(languoids)
+
+    def save(self, path: Path):
+        save_json({"languoids": self.languoids, "living_languages": self.living_languages}, path)
+
+    @classmethod
+    def load(cls, path: Path):
+        with path.open() as index_file:
+            data = json.load(index_file)
+        if "languoids" in data:
+            return cls(data["languoids"], data["living_languages"])
+        # An index stored before the counts were stored with it
+        index = cls(data)
+        index.save(path)
+        return index
+
+
+@functools.lru_cache
+def load_index(tag: str = GLOTTOLOG_TAG, cache_dir: Path = CACHE_DIR) -> GlottologIndex:
+    """Load the index of a Glottolog version, building it on first use.
+
+    Building the index needs the Glottolog repository, through cldfcatalog,
+    and takes a walk over all of it. The result is stored in `cache_dir`, so
+    later calls for the same tag only read that file, and within a process
+    the loaded index is reused.
+
+    """
+    path = cache_dir / f"glottolog-{tag}.json"
+    if path.exists():
+        return GlottologIndex.load(path)
+
+    import pyglottolog
+    from cldfcatalog import Catalog
+
+    with Catalog.from_config("glottolog", tag=tag) as glottolog_repo:
+        index = GlottologIndex.from_glottolog(pyglottolog.Glottolog(glottolog_repo.dir))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    index.save(path)
+    return index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Build the index of a Glottolog version that the
+        calibration and sampling proportion steps use, or rebuild it."""
+    )
+    parser.add_argument(
+        "--tag",
+        default=GLOTTOLOG_TAG,
+        help=f"""Glottolog version to index. (default: {GLOTTOLOG_TAG})""",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=CACHE_DIR,
+        help=f"""Directory to store the index in. (default: {CACHE_DIR})""",
+    )
+    args = parser.parse_args()
+
+    (args.cache_dir / f"glottolog-{args.tag}.json").unlink(missing_ok=True)
+    index = load_index(args.tag, args.cache_dir)
+    print(f"Indexed {len(index.languoids):} languoids of Glottolog {args.tag}")
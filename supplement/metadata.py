@@ -0,0 +1,95 @@
+import lxml.etree as ET
+
+
+def iter_metadata(path):
+    """Stream the data summary of a BEAST XML file without building the tree.
+
+    Yield triples `(kind, name, value)`, which are
+     - `("sequence", taxon, length)` for every sequence of the alignment,
+     - `("tip_date", taxon, date)` for every entry of the date-backward trait,
+     - `("partition", concept, filter)` for every concept partition.
+
+    Elements are cleared as soon as they have been read, so memory use does
+    not grow with the size of the alignment.
+
+    """
+    for _, element in ET.iterparse(
+        str(path),
+        events=("end",),
+        tag=("sequence", "trait", "data"),
+        resolve_entities=False,
+    ):
+        if element.tag == "sequence":
+            yield "sequence", element.get("taxon"), len(element.get("value", ""))
+        elif element.tag == "trait":
+            if element.get("traitname") == "date-backward" and element.text:
+                for date in element.text.split(","):
+                    if not date.strip():
+                        continue
+                    tip, date = date.split("=")
+                    yield "tip_date", tip.strip(), float(date.strip())
+        elif element.get("id", "").startswith("concept:"):
+            yield "partition", element.get("id")[len("concept:") :], element.get(
+                "filter"
+            )
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+def taxa(path):
+    """List the taxa of the alignment in a BEAST XML file."""
+    return [name for kind, name, _ in iter_metadata(path) if kind == "sequence"]
+
+
+def count_languages(path) -> int:
+    """Count the extant languages in a BEAST XML file.
+
+    This streams the file and gives the same result as `set_rho.count_languages`.
+
+    """
+    n_sequences = 0
+    ancient = 0
+    for kind, _, value in iter_metadata(path):
+        if kind == "sequence":
+            n_sequences += 1
+        elif kind == "tip_date" and value != 0.0:
+            ancient += 1
+    return n_sequences - ancient
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Summarize the data in a BEAST XML file, as a quick
+        check before running the heavier transforms on it."""
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help="""Input beast XML.""",
+    )
+    args = parser.parse_args()
+
+    lengths = set()
+    sequences = 0
+    ancient = {}
+    partitions = 0
+    for kind, name, value in iter_metadata(args.input):
+        if kind == "sequence":
+            sequences += 1
+            lengths.add(value)
+        elif kind == "tip_date" and value != 0.0:
+            ancient[name] = value
+        elif kind == "partition":
+            partitions += 1
+
+    print(f"{sequences:} sequences of length {', '.join(map(str, sorted(lengths)))}")
+    print(f"{partitions:} partitions")
+    print(f"{len(ancient):} dated tips:")
+    for name, date in ancient.items():
+        print(f"  {name:} = {date:}")
+    if len(lengths) > 1:
+        raise SystemExit("Sequences in the alignment differ in length.")
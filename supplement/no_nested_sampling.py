@@ -1,7 +1,9 @@
 import lxml.etree as ET
 
+from beast_xml import DocumentIndex
 
-def replace_clock(root):
+
+def replace_clock(root, index=None):
     """
 
     >>> root = ET.XML("<beast><branchRateModel id="Clock" spec="beast.evolution.branchratemodel.StrictClockModel" clock.rate="@clockrate" /></beast>")
@@ -13,16 +15,19 @@ def replace_clock(root):
     </beast>
     """
 
-    for logger in root.findall(".//logger"):
-        logger.set("spec", "Logger")
+    if index is None:
+        index = DocumentIndex(root)
+
+    for logger in index.findall("logger"):
+        index.set(logger, "spec", "Logger")
         logger.set("logEvery", "10000")
 
-    mcmc = root.find(".//run")
+    mcmc = index.find("run")
     del mcmc.attrib["epsilon"]
     del mcmc.attrib["subChainLength"]
     del mcmc.attrib["particleCount"]
     mcmc.set("storeEvery", "10000")
-    mcmc.set("spec", "MCMC")
+    index.set(mcmc, "spec", "MCMC")
 
     return root
 
@@ -0,0 +1,213 @@
+import functools
+import logging
+import runpy
+
+import no_nested_sampling
+import config_sampled_ancestors
+import set_rho
+from beast_xml import DocumentIndex, read_xml, write_xml
+from calibrations import load_languages, add_calibrations
+from glottolog_index import load_index
+from variants import write_variants
+
+
+def load_calibrations(script):
+    """Load the CALIBRATIONS list from a family's add_calibrations.py script."""
+    return runpy.run_path(str(script))["CALIBRATIONS"]
+
+
+def calibrate(
+    root,
+    calibrations,
+    metadata,
+    family=None,
+    subset=None,
+    sampled_ancestors=False,
+    first_writing=None,
+    index=None,
+):
+    languages = load_languages(metadata, family=family, subset=subset)
+    for lang in languages:
+        print(lang)
+    add_calibrations(
+        root,
+        calibrations,
+        languages,
+        sampled_ancestors=sampled_ancestors,
+        first_writing=first_writing,
+        index=index,
+    )
+    return root
+
+
+def sampled_ancestors(root, jumping, sampled, index=None):
+    if index is None:
+        index = DocumentIndex(root)
+    all_languages = {e.attrib.get("taxon") for e in index.findall("sequence")}
+    if set(jumping) - all_languages:
+        logging.warning(
+            "“Jumping” languages %s were not in the XML file", set(jumping) - all_languages
+        )
+    if jumping:
+        root = config_sampled_ancestors.into_jump_operator(
+            root, set(jumping) & all_languages, index
+        )
+
+    if set(sampled) - all_languages:
+        logging.warning(
+            "Sampled ancestor languages %s were not in the XML file",
+            set(sampled) - all_languages,
+        )
+    if sampled:
+        root = config_sampled_ancestors.into_jump_operator(
+            root, set(sampled) & all_languages, index
+        )
+    return root
+
+
+def rho(root, clade=None, n=None, index=None):
+    if clade:
+        n = set_rho.glottolog_count_languages(load_index(), clade)
+    sampled = set_rho.count_languages(root, index)
+    return set_rho.replace_rho(root, rho=min(sampled / n, 1), index=index)
+
+
+def run(root, steps):
+    """Apply each transform in steps to the tree, in order.
+
+    All transforms share one index of the tree, which is built only once.
+
+    """
+    index = DocumentIndex(root)
+    for step in steps:
+        root = step(root, index=index)
+    return root
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Turn an undated BEAST XML into a dated analysis in one go.
+
+        This parses the input once and applies, in memory and in this order,
+        the transforms of no_nested_sampling.py, add_calibrations.py,
+        config_sampled_ancestors.py and set_rho.py that are requested, before
+        writing the result."""
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help="""Input beast XML, as exported from the template.""",
+    )
+    parser.add_argument(
+        "--no-nested-sampling",
+        action="store_true",
+        default=False,
+        help="Replace nested sampling by plain MCMC.",
+    )
+    parser.add_argument(
+        "--calibrations",
+        "-c",
+        type=Path,
+        help="""A family's add_calibrations.py script, providing a CALIBRATIONS list. (Default: Do not add calibrations.)""",
+    )
+    parser.add_argument(
+        "--metadata",
+        "-m",
+        type=Path,
+        default="raw_cldf/cldf-metadata.json",
+        help="""Metadata file, for language list""",
+    )
+    parser.add_argument(
+        "--family",
+        "-f",
+        help="""Only include languages within this Glottolog clade""",
+    )
+    parser.add_argument(
+        "--subset",
+        type=argparse.FileType("r"),
+        help="A file (or '-' for stdin) containing one language to be included per line",
+    )
+    parser.add_argument(
+        "--first-writing",
+        "-w",
+        type=float,
+        help="The date (BP) when writing started in the region. (Default: Don't modify this parameter in the template.)",
+    )
+    parser.add_argument(
+        "--fbd",
+        action="store_true",
+        default=False,
+        help="Add calibrations for a sampled ancestor tree, which needs variant operators.",
+    )
+    parser.add_argument(
+        "--jumping",
+        "-j",
+        action="append",
+        default=[],
+        help="A tip that jumps between being a sampled ancestor or not.",
+    )
+    parser.add_argument(
+        "--sampled-ancestor",
+        "-s",
+        action="append",
+        default=[],
+        help="A tip to initialize as sampled ancestor.",
+    )
+    parser.add_argument(
+        "--rho-clade", help="The glottolog clade to count as reference for rho"
+    )
+    parser.add_argument(
+        "--rho-n", type=int, help="The total number of languages this is sampled from"
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        required=True,
+        help="""File to write output to.""",
+    )
+    parser.add_argument(
+        "--variants",
+        action="store_true",
+        default=False,
+        help="""Also write the clock model variants of the output, as variants.py does.""",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        default=False,
+        help="""Write the output with plates expanded and without comments and indentation, for faster BEAST startup.""",
+    )
+    args = parser.parse_args()
+
+    steps = []
+    if args.no_nested_sampling:
+        steps.append(no_nested_sampling.replace_clock)
+    if args.calibrations:
+        steps.append(
+            functools.partial(
+                calibrate,
+                calibrations=load_calibrations(args.calibrations),
+                metadata=args.metadata,
+                family=args.family,
+                subset=args.subset,
+                sampled_ancestors=args.fbd,
+                first_writing=args.first_writing,
+            )
+        )
+    if args.jumping or args.sampled_ancestor:
+        steps.append(
+            functools.partial(
+                sampled_ancestors, jumping=args.jumping, sampled=args.sampled_ancestor
+            )
+        )
+    if args.rho_clade or args.rho_n:
+        steps.append(functools.partial(rho, clade=args.rho_clade, n=args.rho_n))
+
+    root = run(read_xml(args.input), steps)
+    write_xml(root, args.output, args.compact)
+    if args.variants:
+        write_variants(root, args.output, compact_output=args.compact)
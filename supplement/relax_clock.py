@@ -1,11 +1,16 @@
 import lxml.etree as ET
 
+from beast_xml import DocumentIndex
 
-def count_languages(root) -> int:
-    n_sequences = len(root.findall(".//sequence"))
+
+def count_languages(root, index=None) -> int:
+    if index is None:
+        index = DocumentIndex(root)
+    n_sequences = len(index.findall("sequence"))
     return n_sequences
 
-def replace_clock(root):
+
+def replace_clock(root, index=None):
     """
 
     >>> root = ET.XML("<beast><branchRateModel id="Clock" spec="beast.evolution.branchratemodel.StrictClockModel" clock.rate="@clockrate" /></beast>")
@@ -17,15 +22,18 @@ def replace_clock(root):
     </beast>
     """
 
-    clock_model = root.find(
-        ".//*[@spec='beast.evolution.branchratemodel.StrictClockModel']"
+    if index is None:
+        index = DocumentIndex(root)
+
+    clock_model = index.find(
+        spec="beast.evolution.branchratemodel.StrictClockModel"
     )
     assert clock_model is not None
     id = clock_model.get("id")
-    clock_model.set("spec", "beast.evolution.branchratemodel.UCRelaxedClockModel")
+    index.set(clock_model, "spec", "beast.evolution.branchratemodel.UCRelaxedClockModel")
     clock_model.set("rates", "@RelaxedClockBranchRates")
     clock_model.set("tree", "@tree")
-    ET.SubElement(
+    index.sub_element(
         clock_model,
         "distr",
         id="ClockRatesPrior",
@@ -35,8 +43,8 @@ def replace_clock(root):
         meanInRealSpace="true",
     )
 
-    state = root.find(".//state[@id='state']")
-    clock_sigma = ET.SubElement(
+    state = index.find("state", id="state")
+    clock_sigma = index.sub_element(
         state,
         "parameter",
         id="RelaxedClockSigma",
@@ -45,7 +53,7 @@ def replace_clock(root):
         name="stateNode",
     )
     clock_sigma.text = "0.2"
-    clock_rates = ET.SubElement(
+    clock_rates = index.sub_element(
         state,
         "parameter",
         id="RelaxedClockBranchRates",
@@ -53,13 +61,13 @@ def replace_clock(root):
         lower="0.0",
         name="stateNode",
     )
-    clock_rates.text = " 1.0" * (count_languages(root) * 2)
+    clock_rates.text = " 1.0" * (count_languages(root, index) * 2)
 
-    prior = root.find(".//distribution[@id='prior']")
+    prior = index.find("distribution", id="prior")
     # TODO: This seems to be redundant with the ClockRatesPrior??? We don't
     # know why it needs to be in there twice, with potentially different specs,
     # and have contacted Jordan Douglas to find out.
-    ratesprior = ET.SubElement(
+    ratesprior = index.sub_element(
         prior,
         "prior",
         spec="Prior",
@@ -67,7 +75,7 @@ def replace_clock(root):
         name="distribution",
         x="@RelaxedClockBranchRates",
     )
-    ET.SubElement(
+    index.sub_element(
         ratesprior,
         "distr",
         id="LogNormal.RelaxedClockBranchRates",
@@ -76,7 +84,7 @@ def replace_clock(root):
         M="1.0",
         meanInRealSpace="true",
     )
-    sigmaprior = ET.SubElement(
+    sigmaprior = index.sub_element(
         prior,
         "prior",
         spec="Prior",
@@ -84,7 +92,7 @@ def replace_clock(root):
         name="distribution",
         x="@RelaxedClockSigma",
     )
-    ET.SubElement(
+    index.sub_element(
         sigmaprior,
         "distr",
         id="Gamma.RelaxedClockSigma",
@@ -94,13 +102,13 @@ def replace_clock(root):
         beta="0.3819",
     )
 
-    logger = root.find(".//logger[@id='tracelog']")
-    ET.SubElement(
+    logger = index.find("logger", id="tracelog")
+    index.sub_element(
         logger,
         "log",
         idref="RelaxedClockSigma",
     )
-    ET.SubElement(
+    index.sub_element(
         logger,
         "log",
         id="RatesStat",
@@ -109,10 +117,10 @@ def replace_clock(root):
         tree="@tree",
     )
 
-    ET.SubElement(
+    index.sub_element(
         root, "kernel", id="BactrianKernel", spec="KernelDistribution$Bactrian"
     )
-    ET.SubElement(
+    index.sub_element(
         root,
         "metric",
         id="RobinsonsFould",
@@ -120,8 +128,8 @@ def replace_clock(root):
         taxonset="@taxa",
     )
 
-    operators = root.find(".//operator").getparent()
-    operator = ET.SubElement(
+    operators = index.find("operator").getparent()
+    operator = index.sub_element(
         operators,
         "operator",
         id="ORCAdaptableOperatorSampler_sigma",
@@ -129,7 +137,7 @@ def replace_clock(root):
         weight="3.0",
         parameter="@RelaxedClockSigma",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCucldStdevScaler",
@@ -141,7 +149,7 @@ def replace_clock(root):
         weight="1.0",
         kernel="@BactrianKernel",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCUcldStdevRandomWalk",
@@ -151,7 +159,7 @@ def replace_clock(root):
         weight="1.0",
         kernelDistribution="@BactrianKernel",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCUcldStdevScale",
@@ -162,7 +170,7 @@ def replace_clock(root):
         weight="1.0",
         kernelDistribution="@BactrianKernel",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCSampleFromPriorOperator_sigma",
@@ -172,7 +180,7 @@ def replace_clock(root):
         weight="1.0",
     )
 
-    operator = ET.SubElement(
+    operator = index.sub_element(
         operators,
         "operator",
         id="ORCAdaptableOperatorSampler_rates_root",
@@ -181,7 +189,7 @@ def replace_clock(root):
         weight="0.1",
         parameter="@RelaxedClockBranchRates",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCRootOperator1",
@@ -193,7 +201,7 @@ def replace_clock(root):
         weight="1.0",
         kernel="@BactrianKernel",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCRootOperator2",
@@ -206,7 +214,7 @@ def replace_clock(root):
         kernel="@BactrianKernel",
     )
 
-    operator = ET.SubElement(
+    operator = index.sub_element(
         operators,
         "operator",
         id="ORCAdaptableOperatorSampler",
@@ -215,7 +223,7 @@ def replace_clock(root):
         weight="20.0",
         parameter="@RelaxedClockBranchRates",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCInternalnodesOperator",
@@ -227,7 +235,7 @@ def replace_clock(root):
         weight="1.0",
         kernel="@BactrianKernel",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCRatesRandomWalk",
@@ -237,7 +245,7 @@ def replace_clock(root):
         weight="1.0",
         kernelDistribution="@BactrianKernel",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCRatesScale",
@@ -248,7 +256,7 @@ def replace_clock(root):
         weight="1.0",
         kernelDistribution="@BactrianKernel",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCSampleFromPriorOperator",
@@ -258,7 +266,7 @@ def replace_clock(root):
         weight="1.0",
     )
 
-    operator = ET.SubElement(
+    operator = index.sub_element(
         operators,
         "operator",
         id="ORCAdaptableOperatorSampler_NER.c:clock",
@@ -267,7 +275,7 @@ def replace_clock(root):
         weight="15.0",
         metric="@RobinsonsFould",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCNER_Exchange",
@@ -275,7 +283,7 @@ def replace_clock(root):
         tree="@tree",
         weight="0.0",
     )
-    ET.SubElement(
+    index.sub_element(
         operator,
         "operator",
         id="ORCNER_dAE_dBE_dCE",
@@ -285,7 +293,7 @@ def replace_clock(root):
         weight="1.0",
     )
 
-    logger = root.find(".//log[@spec='beast.evolution.tree.TreeWithMetaDataLogger']")
+    logger = index.find("log", spec="beast.evolution.tree.TreeWithMetaDataLogger")
     logger.set("branchratemodel", f"@{id}")
 
     return root
@@ -1,9 +1,10 @@
 import lxml.etree as ET
-import pyglottolog
-from cldfcatalog import Catalog
 
+from beast_xml import DocumentIndex
+from glottolog_index import load_index
 
-def replace_rho(root, rho):
+
+def replace_rho(root, rho, index=None):
     """
 
     >>> root = ET.XML("<beast><branchRateModel id="Clock" spec="beast.evolution.branchratemodel.StrictClockModel" clock.rate="@clockrate" /></beast>")
@@ -15,30 +16,32 @@ def replace_rho(root, rho):
     </beast>
     """
 
-    rho_p = root.find(".//parameter[@name='rho']")
+    if index is None:
+        index = DocumentIndex(root)
+
+    rho_p = index.find("parameter", name="rho")
     assert rho_p is not None
     rho_p.text = str(rho)
 
     return root
 
 
-def count_languages(root) -> int:
-    tip_dates = root.find(".//trait[@traitname='date-backward']")
+def count_languages(root, index=None) -> int:
+    if index is None:
+        index = DocumentIndex(root)
+    tip_dates = index.find("trait", traitname="date-backward")
     ancient = 0
     for date in tip_dates.text.split(","):
         tip, date = date.split("=")
         if float(date.strip()) != 0.0:
             ancient += 1
-    n_sequences = len(root.findall(".//sequence"))
+    n_sequences = len(index.findall("sequence"))
     return n_sequences - ancient
 
 
-def glottolog_count_languages(languoid) -> int:
-    if languoid.level.id == "language" and (
-        languoid.endangerment is None or languoid.endangerment.status.id != "extinct"
-    ):
-        return 1 + sum(glottolog_count_languages(sub) for sub in languoid.children)
-    return sum(glottolog_count_languages(sub) for sub in languoid.children)
+def glottolog_count_languages(glottolog, clade) -> int:
+    """Count the living languages in a clade of a `GlottologIndex`."""
+    return glottolog.count_living_languages(clade)
 
 
 if __name__ == "__main__":
@@ -68,10 +71,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     if args.clade:
-        with Catalog.from_config("glottolog", tag="v4.3") as glottolog_repo:
-            glottolog = pyglottolog.Glottolog(glottolog_repo.dir)
-        languoid = glottolog.languoid(args.clade)
-        n = glottolog_count_languages(languoid)
+        n = glottolog_count_languages(load_index(), args.clade)
 
     elif args.n:
         n = args.n
@@ -0,0 +1,404 @@
+import copy
+import functools
+import logging
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import no_nested_sampling
+import pipeline
+import set_rho
+from beast_xml import DocumentIndex, read_xml, write_xml
+from calibrations import add_calibrations, load_languages
+from glottolog_index import load_index
+from variants import write_variants
+
+# The undated tree of all languages and the settings of the study, shared
+# with forked worker processes without pickling them.
+_base = None
+_study = None
+
+
+def parse_filter(filter: str) -> list[int]:
+    """List the (1-based) alignment columns a FilteredAlignment filter selects.
+
+    >>> parse_filter("1,2-5")
+    [1, 2, 3, 4, 5]
+
+    """
+    columns = []
+    for part in filter.split(","):
+        first, _, last = part.partition("-")
+        columns.extend(range(int(first), int(last or first) + 1))
+    return columns
+
+
+def format_filter(columns: list[int]) -> str:
+    """Write (1-based) alignment columns as a FilteredAlignment filter.
+
+    >>> format_filter([1, 4, 5, 6, 9])
+    '1,4-6,9'
+
+    """
+    parts = []
+    start = end = columns[0]
+    for column in columns[1:] + [None]:
+        if column == end + 1:
+            end = column
+            continue
+        parts.append(f"{start:}" if start == end else f"{start:}-{end:}")
+        start = end = column
+    return ",".join(parts)
+
+
+def restrict_taxa(root, taxa, index=None):
+    """Remove all languages not in taxa from an undated BEAST XML.
+
+    Their sequences and taxa are removed, and so are the columns of the
+    alignment that none of the remaining languages has a 1 in, as if the
+    alignment had been exported for the subset only. The filters of the
+    partitions are renumbered to match, keeping the columns they exclude for
+    the ascertainment correction.
+
+    """
+    if index is None:
+        index = DocumentIndex(root)
+    taxa = set(taxa)
+    sequences = index.findall("sequence")
+    alignment = sequences[0].getparent()
+    for sequence in sequences:
+        if sequence.get("taxon") not in taxa:
+            index.remove(sequence)
+    sequences = [s for s in sequences if s.get("taxon") in taxa]
+    for plate in index.id("taxa").iter("plate"):
+        plate.set("range", ",".join(l for l in plate.get("range").split(",") if l in taxa))
+
+    values = [s.get("value") for s in sequences]
+    keep = {
+        column + 1
+        for column, states in enumerate(zip(*values))
+        if any(state not in "0?" for state in states)
+    }
+    partitions = [
+        p
+        for p in index.findall("data", spec="FilteredAlignment")
+        if p.get("data") == f"@{alignment.get('id'):}"
+    ]
+    for partition in partitions:
+        columns = parse_filter(partition.get("filter"))
+        excluded = range(int(partition.get("excludefrom", 0)), int(partition.get("excludeto", 0)))
+        keep.update(columns[i] for i in excluded)
+    keep = sorted(keep)
+
+    for sequence, value in zip(sequences, values):
+        sequence.set("value", "".join(value[column - 1] for column in keep))
+    renumber = {column: new for new, column in enumerate(keep, 1)}
+    for partition in partitions:
+        columns = [renumber[c] for c in parse_filter(partition.get("filter")) if c in renumber]
+        if len(columns) <= int(partition.get("excludeto", 0)):
+            logging.warning("Partition %s has no variable columns left", partition.get("id"))
+        partition.set("filter", format_filter(columns))
+    return root
+
+
+def prune_calibrations(calibrations, taxa, drop_incomplete=False):
+    """Adjust calibrations to the languages in taxa.
+
+    Tip dates of missing languages are dropped. Clade calibrations given as
+    sets of languages are restricted to the languages present, and dropped if
+    fewer than two remain, or with `drop_incomplete`, if any are missing.
+    Calibrations of Glottolog clades are resolved against the available
+    languages anyway, so they are kept as they are, even if they also list
+    languages. The calibrations are copied, so the originals can be reused
+    for other subsets.
+
+    >>> calibrations = [
+    ...     {"languages": {"a", "b", "c"}, "d": {}},
+    ...     {"languages": {"a", "c"}, "glottolog_clade": "fam1", "d": {}},
+    ... ]
+    >>> for c in prune_calibrations(calibrations, {"a", "b"}):
+    ...     print(sorted(c["languages"]), c.get("glottolog_clade"), c.get("name"))
+    ['a', 'b'] None a_b_c
+    ['a', 'c'] fam1 None
+    >>> [c.get("glottolog_clade") for c in prune_calibrations(calibrations, {"a", "b"}, True)]
+    ['fam1']
+
+    """
+    pruned = []
+    for c in copy.deepcopy(calibrations):
+        if "languages" not in c or c.get("glottolog_clade") is not None:
+            pruned.append(c)
+            continue
+        present = set(c["languages"]) & set(taxa)
+        name = c.get("name", "_".join(sorted(c["languages"])))
+        if present == set(c["languages"]):
+            pruned.append(c)
+        elif len(c["languages"]) > 1 and len(present) > 1 and not drop_incomplete:
+            logging.info("Calibration %s restricted to %s", name, sorted(present))
+            pruned.append(dict(c, languages=present, name=name))
+        else:
+            logging.info("Calibration %s dropped", name)
+    return pruned
+
+
+def random_subsets(languages, n: int, size: int, seed: int = 0) -> dict[str, list[str]]:
+    """Draw n random subsets of size languages each, reproducibly."""
+    rng = random.Random(seed)
+    return {
+        f"random{i:03d}": sorted(rng.sample(sorted(languages), size)) for i in range(n)
+    }
+
+
+def date_subset(root, taxa):
+    """Restrict an undated tree to taxa and apply all steps of the study to it."""
+    steps = [functools.partial(restrict_taxa, taxa=taxa)]
+    if _study["no_nested_sampling"]:
+        steps.append(no_nested_sampling.replace_clock)
+    if _study["calibrations"]:
+        languages = {l: _study["languages"][l] for l in sorted(taxa) if l in _study["languages"]}
+
+        def calibrate(root, index):
+            add_calibrations(
+                root,
+                prune_calibrations(_study["calibrations"], taxa, _study["drop_incomplete"]),
+                languages,
+                sampled_ancestors=_study["fbd"],
+                first_writing=_study["first_writing"],
+                index=index,
+            )
+            return root
+
+        steps.append(calibrate)
+    if _study["jumping"] or _study["sampled"]:
+        steps.append(
+            lambda root, index: pipeline.sampled_ancestors(
+                root,
+                set(_study["jumping"]) & set(taxa),
+                set(_study["sampled"]) & set(taxa),
+                index,
+            )
+        )
+    if _study["rho_n"]:
+        steps.append(lambda root, index: pipeline.rho(root, n=_study["rho_n"], index=index))
+    return pipeline.run(root, steps)
+
+
+def _write_subset(taxa, output):
+    root = date_subset(copy.deepcopy(_base), taxa)
+    write_xml(root, output, _study["compact"])
+    if _study["variants"]:
+        write_variants(root, output, jobs=1, compact_output=_study["compact"])
+    with output.with_suffix(".languages").open("w") as languages:
+        print("Language", file=languages)
+        for language in sorted(taxa):
+            print(language, file=languages)
+    return output
+
+
+def write_subsets(root, subsets, output_pattern: str, study: dict, jobs=None):
+    """Write a dated XML for each subset of languages, in parallel.
+
+    `subsets` maps subset names to lists of languages, and `output_pattern`
+    names the output files, with `{subset}` standing for the subset name.
+    Each subset is restricted, dated and serialized in its own worker
+    process. The workers are forked, so they inherit the parsed undated tree
+    and the loaded languages and calibrations. `study["rho_n"]` is the
+    number of languages the subsets are sampled from, already counted, so
+    that the workers need no Glottolog.
+
+    """
+    global _base, _study
+    _base = root
+    _study = study
+    outputs = {name: Path(output_pattern.format(subset=name)) for name in subsets}
+    if "fork" not in multiprocessing.get_all_start_methods() or jobs == 1:
+        for name, output in outputs.items():
+            _write_subset(subsets[name], output)
+        return outputs
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context("fork"),
+    ) as pool:
+        for future in [
+            pool.submit(_write_subset, subsets[name], output)
+            for name, output in outputs.items()
+        ]:
+            future.result()
+    return outputs
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Write dated BEAST XMLs for many subsets of the languages
+        of one undated XML, for subsampling studies.
+
+        The undated XML, the CLDF languages and the calibrations are loaded
+        once. For each subset, the alignment is restricted to its languages,
+        calibrations of missing languages are pruned, and the transforms of
+        pipeline.py are applied. Each output comes with a .languages file
+        listing its languages."""
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help="""Input beast XML with all languages, as exported from the template.""",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        required=True,
+        help="""Output file pattern, with {subset} standing for the subset name, like indoeuropean-{subset}.xml""",
+    )
+    parser.add_argument(
+        "--subset",
+        type=Path,
+        action="append",
+        default=[],
+        help="A file containing one language to be included per line, named by its file name",
+    )
+    parser.add_argument(
+        "--random",
+        type=int,
+        default=0,
+        help="Number of random subsets to draw from the languages of the input",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        help="Number of languages in each random subset",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for drawing the random subsets",
+    )
+    parser.add_argument(
+        "--no-nested-sampling",
+        action="store_true",
+        default=False,
+        help="Replace nested sampling by plain MCMC.",
+    )
+    parser.add_argument(
+        "--calibrations",
+        "-c",
+        type=Path,
+        help="""A family's add_calibrations.py script for all languages, providing a CALIBRATIONS list. (Default: Do not add calibrations.)""",
+    )
+    parser.add_argument(
+        "--drop-incomplete",
+        action="store_true",
+        default=False,
+        help="Drop clade calibrations with any missing language, instead of restricting them to the languages present.",
+    )
+    parser.add_argument(
+        "--metadata",
+        "-m",
+        type=Path,
+        default="raw_cldf/cldf-metadata.json",
+        help="""Metadata file, for language list""",
+    )
+    parser.add_argument(
+        "--family",
+        "-f",
+        help="""Only include languages within this Glottolog clade""",
+    )
+    parser.add_argument(
+        "--first-writing",
+        "-w",
+        type=float,
+        help="The date (BP) when writing started in the region. (Default: Don't modify this parameter in the template.)",
+    )
+    parser.add_argument(
+        "--fbd",
+        action="store_true",
+        default=False,
+        help="Add calibrations for a sampled ancestor tree, which needs variant operators.",
+    )
+    parser.add_argument(
+        "--jumping",
+        "-j",
+        action="append",
+        default=[],
+        help="A tip that jumps between being a sampled ancestor or not, where it is in the subset.",
+    )
+    parser.add_argument(
+        "--sampled-ancestor",
+        "-s",
+        action="append",
+        default=[],
+        help="A tip to initialize as sampled ancestor, where it is in the subset.",
+    )
+    parser.add_argument(
+        "--rho-clade", help="The glottolog clade to count as reference for rho"
+    )
+    parser.add_argument(
+        "--rho-n", type=int, help="The total number of languages this is sampled from"
+    )
+    parser.add_argument(
+        "--variants",
+        action="store_true",
+        default=False,
+        help="""Also write the clock model variants of each output, as variants.py does.""",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        default=False,
+        help="""Write the outputs with plates expanded and without comments and indentation, for faster BEAST startup.""",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="""Number of worker processes. (default: One per CPU)""",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="store_true",
+        default=False,
+        help="""Report how the calibrations were pruned for each subset.""",
+    )
+    args = parser.parse_args()
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO)
+    if args.random and not args.size:
+        parser.error("--random needs --size")
+
+    root = read_xml(args.input)
+    all_languages = {s.get("taxon") for s in root.iter("sequence")}
+    subsets = {}
+    for subset in args.subset:
+        with subset.open() as lines:
+            languages = {l.strip() for l in lines} - {"Language", ""}
+        if languages - all_languages:
+            logging.warning(
+                "Languages %s of subset %s were not in the XML file",
+                languages - all_languages,
+                subset.stem,
+            )
+        subsets[subset.stem] = sorted(languages & all_languages)
+    subsets.update(random_subsets(all_languages, args.random, args.size, args.seed))
+
+    study = {
+        "no_nested_sampling": args.no_nested_sampling,
+        "calibrations": args.calibrations and pipeline.load_calibrations(args.calibrations),
+        "languages": args.calibrations and load_languages(args.metadata, family=args.family),
+        "drop_incomplete": args.drop_incomplete,
+        "fbd": args.fbd,
+        "first_writing": args.first_writing,
+        "jumping": args.jumping,
+        "sampled": args.sampled_ancestor,
+        "rho_n": (
+            set_rho.glottolog_count_languages(load_index(), args.rho_clade)
+            if args.rho_clade
+            else args.rho_n
+        ),
+        "variants": args.variants,
+        "compact": args.compact,
+    }
+    for output in write_subsets(root, subsets, args.output, study, args.jobs).values():
+        print(output)
@@ -0,0 +1,113 @@
+import copy
+import functools
+from pathlib import Path
+
+import lxml.etree as ET
+
+from beast_xml import write_xml
+
+TEMPLATE = Path(__file__).parent / "template.md"
+
+
+def compile_template(markdown: Path = TEMPLATE):
+    """Parse the XML chunks of a literate markdown template into one tree.
+
+    The chunks are the ```xml code blocks, which are fed to the parser in
+    order. The prose between them is skipped.
+
+    """
+    parser = ET.XMLParser(remove_blank_text=True, resolve_entities=False)
+    chunk = None
+    for line in markdown.open("rb"):
+        if b"```xml" in line:
+            chunk = b""
+        elif b"```" in line:
+            if chunk is not None:
+                parser.feed(chunk)
+            chunk = None
+        elif chunk is not None:
+            chunk += line
+    return parser.close()
+
+
+@functools.lru_cache
+def _compiled(markdown: Path, mtime: int):
+    return compile_template(markdown)
+
+
+def render(family=None, partitions=None, trace_log=None, tree_log=None, markdown: Path = TEMPLATE):
+    """Instantiate the template for one analysis, as a new tree.
+
+    The template is compiled once per process (and again only if it
+    changes), so each call is a copy of the compiled tree with the parameters
+    filled in:
+
+    - `family` replaces "vocabulary" everywhere, as `sed s/vocabulary/FAMILY/g` would
+    - `partitions`, a list of concept names, becomes the range of the concept plates
+    - `trace_log` and `tree_log` are the file names of the trace and tree loggers
+
+    >>> root = render("bantu", ["hand", "foot"])
+    >>> root.find(".//logger[@id='tracelog']").get("fileName")
+    'bantu.log'
+    >>> root.find(".//plate[@var='concept']").get("range")
+    'hand,foot'
+
+    """
+    root = copy.deepcopy(_compiled(markdown, markdown.stat().st_mtime_ns))
+    # Comments too, like sed would
+    for element in root.iter():
+        if family is not None:
+            if isinstance(element.tag, str):
+                for key, value in element.attrib.items():
+                    if "vocabulary" in value:
+                        element.set(key, value.replace("vocabulary", family))
+            if element.text and "vocabulary" in element.text:
+                element.text = element.text.replace("vocabulary", family)
+            if element.tail and "vocabulary" in element.tail:
+                element.tail = element.tail.replace("vocabulary", family)
+        if partitions is not None and element.tag == "plate" and element.get("var") == "concept":
+            element.set("range", ",".join(partitions))
+    for logger, file_name in [("tracelog", trace_log), ("treelog", tree_log)]:
+        if file_name is not None:
+            root.find(f".//logger[@id='{logger:}']").set("fileName", file_name)
+    return root
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Render the BEAST XML template from the literate template.md,
+        optionally filling in the family name, the partitions and the log file
+        names."""
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        help="""File to write output to. (default: Write to stdout)""",
+    )
+    parser.add_argument(
+        "--family",
+        help="""Name to use instead of "vocabulary" in ids and file names""",
+    )
+    parser.add_argument(
+        "--partition",
+        "-p",
+        action="append",
+        help="""A concept partition. (default: Leave the {partitions} placeholder for lexedata to fill in)""",
+    )
+    parser.add_argument("--trace-log", help="""File name of the trace log""")
+    parser.add_argument("--tree-log", help="""File name of the tree log""")
+    parser.add_argument(
+        "--template",
+        type=Path,
+        default=TEMPLATE,
+        help="""Markdown file with the template in xml code blocks""",
+    )
+    args = parser.parse_args()
+
+    write_xml(
+        render(args.family, args.partition, args.trace_log, args.tree_log, args.template),
+        args.output,
+    )
@@ -0,0 +1,115 @@
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import add_burstclock
+import relax_clock
+from beast_xml import DocumentIndex, read_xml, write_xml
+
+# The clock model variants of each analysis, and the transforms that derive
+# them from the strict clock base XML, in the order they are applied.
+VARIANTS = {
+    "burstclock": [add_burstclock.replace_clock],
+    "relaxed": [relax_clock.replace_clock],
+    "relaxed-burstclock": [add_burstclock.replace_clock, relax_clock.replace_clock],
+}
+
+# The base tree, shared with forked worker processes without pickling it.
+_base = None
+
+
+def variant_path(base_path, variant):
+    """Apply our naming convention for variant file paths.
+
+    >>> variant_path(Path("bantu/bantu.xml"), "relaxed")
+    PosixPath('bantu/bantu-relaxed.xml')
+
+    """
+    return base_path.with_name(f"{base_path.stem}-{variant}{base_path.suffix}")
+
+
+def derive(root, variant):
+    """Apply the transforms of a variant to a copy of the base tree."""
+    root = copy.deepcopy(root)
+    index = DocumentIndex(root)
+    for transform in VARIANTS[variant]:
+        root = transform(root, index=index)
+    return root
+
+
+def _write_variant(variant, output, compact_output=False):
+    write_xml(derive(_base, variant), output, compact_output)
+    return output
+
+
+def write_variants(root, base_path, variants=VARIANTS, jobs=None, compact_output=False):
+    """Write all variants of the base tree next to base_path.
+
+    Each variant is derived and serialized in its own worker process. The
+    workers are forked, so they inherit the parsed base tree instead of
+    parsing it again. Where forking is not available, the variants are
+    written one after the other. With `compact_output`, they are written as
+    `write_xml` does with that option.
+
+    """
+    global _base
+    _base = root
+    outputs = {variant: variant_path(base_path, variant) for variant in variants}
+    if "fork" not in multiprocessing.get_all_start_methods() or jobs == 1:
+        for variant, output in outputs.items():
+            _write_variant(variant, output, compact_output)
+        return outputs
+    with ProcessPoolExecutor(
+        max_workers=jobs or len(outputs),
+        mp_context=multiprocessing.get_context("fork"),
+    ) as pool:
+        for future in [
+            pool.submit(_write_variant, variant, output, compact_output)
+            for variant, output in outputs.items()
+        ]:
+            future.result()
+    return outputs
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="""Derive the burst clock, relaxed clock and relaxed burst
+        clock variants from a strict clock beast XML, writing each one next to
+        the input as INPUT-VARIANT.xml."""
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help="""Input beast XML, with a strict clock with id="Clock".""",
+    )
+    parser.add_argument(
+        "--variant",
+        "-v",
+        action="append",
+        choices=list(VARIANTS),
+        help="""Variant to write. (default: All variants)""",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="""Number of worker processes. (default: One per variant)""",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        default=False,
+        help="""Write the variants with plates expanded and without comments and indentation, for faster BEAST startup.""",
+    )
+    args = parser.parse_args()
+
+    write_variants(
+        read_xml(args.input),
+        args.input,
+        variants=args.variant or list(VARIANTS),
+        jobs=args.jobs,
+        compact_output=args.compact,
+    )